@@ -0,0 +1,51 @@
+"""
+Compare instance dispatch (GETTERS[name](...).execute()) against the resolved callables in
+GETTER_FUNCS for the getters used in inner loops.
+
+Each getter is asked about 200 named entities held in one room's Inventory, 2000 times over,
+and the table shows seconds per case for both styles. Loading the getters pulls in the game's
+server.conf, so run it from inside a game directory:
+
+    python benchmarks/bench_getters.py
+"""
+import timeit
+
+from snekmud import WORLD, COMPONENTS, GETTERS, GETTER_FUNCS
+from snekmud.hooks import build_getter_funcs
+from snekmud.utils import callables_from_module
+
+
+def setup(count: int = 200):
+    COMPONENTS.update(callables_from_module("snekmud.components"))
+    GETTERS.update(callables_from_module("snekmud.getters"))
+    build_getter_funcs()
+    viewer = WORLD.create_entity(COMPONENTS["Name"]("viewer"))
+    room = WORLD.create_entity(COMPONENTS["Inventory"]())
+    inv = WORLD.component_for_entity(room, COMPONENTS["Inventory"])
+    for i in range(count):
+        ent = WORLD.create_entity(COMPONENTS["Name"](f"thing {i}"))
+        inv.inventory.append(ent)
+    return viewer, room, list(inv.inventory)
+
+
+def main(number: int = 2000):
+    viewer, room, entities = setup()
+
+    cases = {
+        "VisibleTo": (lambda: [GETTERS["VisibleTo"](viewer, e).execute() for e in entities],
+                      lambda: [GETTER_FUNCS["VisibleTo"](viewer, e) for e in entities]),
+        "GetDisplayName": (lambda: [GETTERS["GetDisplayName"](viewer, e).execute() for e in entities],
+                           lambda: [GETTER_FUNCS["GetDisplayName"](viewer, e) for e in entities]),
+        "VisibleContents": (lambda: GETTERS["VisibleContents"](viewer, room).execute(),
+                            lambda: GETTER_FUNCS["VisibleContents"](viewer, room)),
+    }
+
+    print(f"{'getter':<18}{'instance':>12}{'fast':>12}{'speedup':>10}")
+    for name, (slow, fast) in cases.items():
+        t_slow = timeit.timeit(slow, number=number)
+        t_fast = timeit.timeit(fast, number=number)
+        print(f"{name:<18}{t_slow:>11.3f}s{t_fast:>11.3f}s{t_slow / t_fast:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Time the text layout helpers in snekmud.utils on a who list, with and without color markup.
+
+The who list is seeded, so runs are comparable. Each helper is timed on the same lines with
+and without color codes, averaged over 5 runs, which shows how much parsing the markup costs.
+snekmud.utils reads the game's server.conf, so start it from inside a game directory:
+
+    python benchmarks/bench_layout.py [lines]
+"""
+import random
+import sys
+import timeit
+
+from snekmud.utils import visible_width, pad, crop, justify, columnize, wrap
+
+_COLORS = ("|r", "|g", "|y", "|b", "|m", "|c", "|w", "|500", "|[B")
+_TITLES = ("the Adventurer", "the Brave", "the Wanderer", "of the North", "the Unready")
+
+
+def who_list(lines: int, markup: bool, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    out = list()
+    for i in range(lines):
+        name = f"Player{i}"
+        title = rng.choice(_TITLES)
+        if markup:
+            name = f"{rng.choice(_COLORS)}{name}|n"
+            title = f"|x{title}|n"
+        out.append(f"[{rng.randint(1, 100):>3}] {name} {title}")
+    return out
+
+
+def main(lines: int = 10000, number: int = 5):
+    print(f"{'case':<22}{'plain':>12}{'markup':>12}")
+    for label, func in (
+        ("visible_width", lambda rows: [visible_width(r) for r in rows]),
+        ("pad", lambda rows: [pad(r, 40, "l") for r in rows]),
+        ("crop", lambda rows: [crop(r, 24) for r in rows]),
+        ("wrap", lambda rows: wrap(" ".join(rows), 78)),
+        ("justify", lambda rows: justify(" ".join(rows), 78)),
+        ("columnize", lambda rows: columnize(" ".join(rows), columns=3, width=78)),
+    ):
+        times = list()
+        for markup in (False, True):
+            rows = who_list(lines, markup)
+            times.append(timeit.timeit(lambda: func(rows), number=number) / number)
+        print(f"{label:<22}{times[0]:>11.4f}s{times[1]:>11.4f}s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,44 @@
+"""
+Compare spawning entities one deserialize_entity() at a time against stamping them out of a
+template with spawn_entities(), as Prototype.spawn does.
+
+The prototype is a typical NPC made of clonable components. count entities (default 10000)
+are made each way, and building the template is timed separately because it's done once per
+prototype. Only the in-memory World is touched, nothing is saved. The component loaders need
+the game's server.conf, so run it from a game directory:
+
+    python benchmarks/bench_spawn.py [count]
+"""
+import sys
+import timeit
+
+from snekmud import COMPONENTS
+from snekmud.serialize import deserialize_entity, build_template, spawn_entities
+from snekmud.utils import callables_from_module
+
+PROTOTYPE = {
+    "Name": "a goblin",
+    "ShortDescription": "A goblin is here, looking for trouble.",
+    "Description": "Short, green and ugly.",
+    "MetaTypes": {"types": ["npc", "goblinoid"]},
+    "WearSlots": {"slots": ["head", "body", "legs", "feet", "hands"]},
+    "NPC": {},
+}
+
+
+def main(count: int = 10000):
+    COMPONENTS.update(callables_from_module("snekmud.components"))
+
+    t_loop = timeit.timeit(lambda: [deserialize_entity(PROTOTYPE) for _ in range(count)], number=1)
+    t_build = timeit.timeit(lambda: build_template(PROTOTYPE), number=1)
+    template = build_template(PROTOTYPE)
+    t_spawn = timeit.timeit(lambda: spawn_entities(template, count), number=1)
+
+    print(f"{'method':<20}{'seconds':>10}{'entities/s':>14}")
+    print(f"{'deserialize_entity':<20}{t_loop:>10.3f}{count / t_loop:>14.0f}")
+    print(f"{'spawn_entities':<20}{t_spawn:>10.3f}{count / t_spawn:>14.0f}")
+    print(f"template built in {t_build * 1000:.2f}ms, speedup {t_loop / t_spawn:.2f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,91 @@
+"""
+Compare login/logout throughput under each SQLite profile in snekmud.db.tuning.
+
+Each cycle does what a player logging in and out costs the database: load the character,
+create its GameSession and stamp the login, then save the character's data and delete the
+session. Every profile runs against a fresh database file.
+
+Django is configured by this script, with only the apps those models need, against databases
+in a temporary directory that is removed afterwards. The game's own settings and database are
+never used:
+
+    python benchmarks/bench_sqlite.py [cycles]
+"""
+import os
+import sys
+import tempfile
+import time
+
+os.environ["DJANGO_ALLOW_ASYNC_UNSAFE"] = "true"
+
+import django
+from django.conf import settings
+
+
+def setup_django(path: str):
+    settings.configure(
+        INSTALLED_APPS=["django.contrib.auth", "django.contrib.contenttypes", "snekmud.db.accounts",
+                        "snekmud.db.players", "snekmud.db.gamesessions"],
+        AUTH_USER_MODEL="accounts.Account",
+        DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": path}},
+        USE_TZ=True,
+    )
+    from snekmud.db import tuning
+    tuning.install(settings)
+    django.setup()
+
+
+def create_tables():
+    from django.apps import apps
+    from django.db import connection
+    with connection.schema_editor() as editor:
+        for label in ("contenttypes", "auth", "accounts", "players", "gamesessions"):
+            for model in apps.get_app_config(label).get_models():
+                editor.create_model(model)
+
+
+def run(cycles: int, characters: int = 50) -> float:
+    from mudforge.utils import utcnow
+    from snekmud.db.accounts.models import Account
+    from snekmud.db.players.models import PlayerCharacter
+    from snekmud.db.gamesessions.models import GameSession
+
+    account = Account.objects.create(username="bench")
+    ids = [PlayerCharacter.objects.create(name=f"bench{i}", account=account, data={}).id
+           for i in range(characters)]
+    payload = {"Stats": {"strength": 10, "dexterity": 12}, "Name": "bench" * 10}
+
+    start = time.perf_counter()
+    for i in range(cycles):
+        pc = PlayerCharacter.objects.get(id=ids[i % characters])
+        sess = GameSession.objects.create(id=pc, account=account)
+        pc.date_last_login = utcnow()
+        pc.save(update_fields=["date_last_login"])
+
+        pc.data = payload
+        pc.inventory = [payload] * 3
+        pc.save(update_fields=["data", "inventory", "equipment"])
+        sess.delete()
+    return time.perf_counter() - start
+
+
+def main(cycles: int = 2000):
+    from snekmud.db.tuning import SQLITE_PROFILES
+    from django.db import connections
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(os.path.join(tmp, "unused.sqlite"))
+        print(f"{'profile':<14}{'seconds':>10}{'cycles/s':>12}")
+        for profile in SQLITE_PROFILES:
+            conn = connections["default"]
+            conn.close()
+            conn.settings_dict["NAME"] = os.path.join(tmp, f"{profile}.sqlite")
+            settings.SQLITE_PROFILE = profile
+            create_tables()
+            elapsed = run(cycles)
+            print(f"{profile:<14}{elapsed:>10.3f}{cycles / elapsed:>12.0f}")
+        connections.close_all()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -55,6 +55,7 @@ setup(
     long_description_content_type="text/markdown",
     packages=["snekmud",],
     install_requires=get_requirements(),
+    extras_require={"columnar": ["numpy"]},
     zip_safe=False,
     scripts=get_scripts(),
     classifiers=[
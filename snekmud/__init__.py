@@ -1,7 +1,7 @@
-import esper
 from collections import defaultdict
+from snekmud.world import SnekWorld
 
-WORLD = esper.World()
+WORLD = SnekWorld()
 
 MODULES = {}
 
@@ -11,10 +11,24 @@ MODIFIERS_NAMES = defaultdict(dict)
 
 MODIFIERS_ID = defaultdict(dict)
 
+MODIFIERS_HOLDERS = defaultdict(lambda: defaultdict(set))
+
+MODIFIERS_PREFIX = defaultdict(dict)
+
 EQUIP_SLOTS = defaultdict(dict)
 
 PLAYER_ID = dict()
 
+ENTITY_SESSIONS = dict()
+
+LISTENERS = set()
+
+GAME_SESSIONS = dict()
+
+ACCOUNT_SESSIONS = defaultdict(dict)
+
+ACCOUNT_CHARACTERS = dict()
+
 OPERATIONS = dict()
 
 CMDHANDLERS = defaultdict(dict)
@@ -28,3 +42,7 @@ STATIC_TEXT = dict()
 METATYPE_INTEGRITY = defaultdict(list)
 
 GETTERS = dict()
+
+GETTER_FUNCS = dict()
+
+GETTER_BATCH = dict()
@@ -0,0 +1,123 @@
+"""
+Periodic saving of every active character, so a crash loses minutes of progress rather than
+everything since login.
+
+Rather than each session saving on its own timer, the AutosaveScheduler wakes every
+AUTOSAVE_TICK seconds and saves a slice of the sessions, oldest save first, sized so every
+session comes up about once per AUTOSAVE_INTERVAL. A slice is written with one bulk_update in
+one transaction. If writing a slice takes longer than AUTOSAVE_TICK_BUDGET, following slices
+shrink until it doesn't; sessions left unsaved for AUTOSAVE_MAX_STALENESS are saved regardless.
+
+A character which fails to serialize is logged and left out of its slice, and goes to the back
+of the queue as if it had been saved, so it can't hold up everyone else.
+"""
+import asyncio
+import logging
+import math
+import time
+
+from django.db import transaction
+from server.conf import settings
+from snekmud.sessions import all_gamesessions
+
+
+class AutosaveScheduler:
+    # adaptive pacing never shrinks slices below this fraction of their full size.
+    min_scale = 0.1
+    # how quickly slices grow back once writes fit the budget again.
+    recovery = 1.25
+
+    def __init__(self):
+        self.interval = settings.AUTOSAVE_INTERVAL
+        self.tick = settings.AUTOSAVE_TICK
+        self.budget = settings.AUTOSAVE_TICK_BUDGET
+        self.max_staleness = settings.AUTOSAVE_MAX_STALENESS
+        self.scale = 1.0
+        self.task = None
+        self.saved = 0
+        self.overruns = 0
+        self.failures = 0
+
+    def start(self):
+        if self.task is None and self.interval > 0:
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self):
+        while True:
+            started = time.monotonic()
+            try:
+                self.sweep(started)
+            except Exception:
+                logging.exception("Autosave sweep failed.")
+            await asyncio.sleep(max(0.0, self.tick - (time.monotonic() - started)))
+
+    def due(self, now: float) -> list:
+        """
+        The sessions to save this tick: the slice with the oldest saves, plus any beyond
+        max_staleness.
+        """
+        sessions = [s for s in all_gamesessions() if s.handler.character is not None]
+        if not sessions:
+            return sessions
+        sessions.sort(key=lambda s: s.handler.time_last_saved)
+        count = math.ceil(len(sessions) * self.tick / self.interval * self.scale)
+        stale_before = now - self.max_staleness
+        for i in range(count, len(sessions)):
+            if sessions[i].handler.time_last_saved > stale_before:
+                break
+            count = i + 1
+        return sessions[:count]
+
+    def sweep(self, now: float) -> int:
+        """
+        Save the sessions due at now.
+
+        Returns:
+            int: How many were saved.
+        """
+        if not (sessions := self.due(now)):
+            return 0
+        started = time.perf_counter()
+        saved = self.save(sessions)
+        self.adapt(time.perf_counter() - started)
+        return saved
+
+    def save(self, sessions: list) -> int:
+        """
+        Serialize and write sessions' characters. Ones that fail to serialize are skipped.
+
+        Returns:
+            int: How many were saved.
+        """
+        from snekmud.db.players.models import PlayerCharacter
+        fields = set()
+        characters = list()
+        for sess in sessions:
+            try:
+                characters.append(sess.handler.serialize_character())
+            except Exception:
+                logging.exception(f"Autosave could not serialize GameSession {sess.pk}.")
+                self.failures += 1
+                continue
+            fields.update(sess.handler.save_fields)
+        if characters:
+            with transaction.atomic():
+                PlayerCharacter.objects.bulk_update(characters, sorted(fields))
+        # failures too, so they go to the back of the queue.
+        now = time.monotonic()
+        for sess in sessions:
+            sess.handler.time_last_saved = now
+        self.saved += len(characters)
+        return len(characters)
+
+    def adapt(self, elapsed: float):
+        if elapsed > self.budget:
+            self.overruns += 1
+            self.scale = max(self.min_scale, self.scale * self.budget / elapsed)
+        else:
+            self.scale = min(1.0, self.scale * self.recovery)
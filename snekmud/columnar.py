@@ -0,0 +1,201 @@
+"""
+Optional columnar storage for numeric components. Requires numpy.
+
+A ColumnComponent subclass declares its fields like a dataclass, with int, float or bool
+annotations (or numpy dtypes) and defaults:
+
+    class Vitals(ColumnComponent):
+        hp: float = 100.0
+        regen: float = 1.0
+
+Instances are added to entities like any other component and read/write their fields
+through attributes. The values themselves live in one numpy array per field, indexed by a
+dense slot per entity, so a processor can update every entity at once:
+
+    hp = Vitals.column("hp")
+    hp += Vitals.column("regen")
+"""
+import typing
+from snekmud.typing import Entity
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ColumnStore:
+    """
+    One numpy array per field plus a slot map. Rows 0..size-1 are always in use; freeing a
+    slot moves the last row into it.
+    """
+
+    def __init__(self, fields: dict[str, tuple], capacity: int = 64):
+        self.fields = fields
+        self.size = 0
+        self.slots: dict[Entity, int] = dict()
+        self.entities = np.zeros(capacity, dtype=np.int64)
+        self.columns = {name: np.full(capacity, default, dtype=dtype) for name, (dtype, default) in fields.items()}
+
+    @property
+    def capacity(self) -> int:
+        return len(self.entities)
+
+    def _grow(self):
+        new_cap = self.capacity * 2
+        self.entities = np.resize(self.entities, new_cap)
+        for name, (dtype, default) in self.fields.items():
+            col = np.full(new_cap, default, dtype=dtype)
+            col[:self.size] = self.columns[name][:self.size]
+            self.columns[name] = col
+
+    def alloc(self, ent: Entity, values: dict) -> int:
+        if (slot := self.slots.get(ent, None)) is None:
+            if self.size == self.capacity:
+                self._grow()
+            slot = self.size
+            self.size += 1
+            self.slots[ent] = slot
+            self.entities[slot] = ent
+        for name, (dtype, default) in self.fields.items():
+            self.columns[name][slot] = values.get(name, default)
+        return slot
+
+    def free(self, ent: Entity) -> typing.Optional[dict]:
+        """
+        Release ent's row. Returns its values, or None if ent had no row.
+        """
+        if (slot := self.slots.pop(ent, None)) is None:
+            return None
+        values = self.row(slot)
+        last = self.size - 1
+        if slot != last:
+            moved = int(self.entities[last])
+            self.entities[slot] = moved
+            for col in self.columns.values():
+                col[slot] = col[last]
+            self.slots[moved] = slot
+        self.size = last
+        return values
+
+    def row(self, slot: int) -> dict:
+        return {name: col[slot].item() for name, col in self.columns.items()}
+
+    def column(self, name: str):
+        """
+        A writable view of the live rows of a field. Views go stale when rows are added or
+        removed, so don't hold on to one across ticks.
+        """
+        return self.columns[name][:self.size]
+
+    def active(self):
+        return self.entities[:self.size]
+
+
+class ColumnComponent:
+    """
+    Base class for columnar components. The World calls at_world_add and at_world_remove,
+    which move the instance's values into and out of the class's ColumnStore. An instance can
+    only be attached to one entity at a time.
+    """
+    _fields: dict[str, tuple] = dict()
+    _store: typing.Optional[ColumnStore] = None
+    _dtypes = {int: "int64", float: "float64", bool: "bool"}
+    clonable = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if np is None:
+            raise ImportError(f"{cls.__name__} needs numpy, which is not installed.")
+        fields = dict(cls._fields)
+        for name, annotation in cls.__dict__.get("__annotations__", dict()).items():
+            if name.startswith("_"):
+                continue
+            dtype = np.dtype(cls._dtypes.get(annotation, annotation))
+            default = cls.__dict__.get(name, dtype.type(0))
+            fields[name] = (dtype, default)
+            setattr(cls, name, _ColumnField(name))
+        cls._fields = fields
+        cls._store = ColumnStore(fields)
+
+    def __init__(self, **kwargs):
+        unknown = set(kwargs) - set(self._fields)
+        if unknown:
+            raise TypeError(f"{self.__class__.__name__} got unexpected fields: {', '.join(sorted(unknown))}")
+        self._ent = None
+        self._pending = {name: kwargs.get(name, default) for name, (dtype, default) in self._fields.items()}
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{self.__class__.__name__}({fields})"
+
+    def at_world_pre_add(self, ent: Entity):
+        if self._ent is not None and self._ent != ent:
+            raise ValueError(f"{self!r} is already attached to Entity {self._ent}")
+
+    def at_world_add(self, ent: Entity):
+        if self._ent == ent:
+            return
+        self._store.alloc(ent, self._pending)
+        self._ent = ent
+        self._pending = None
+
+    def at_world_remove(self, ent: Entity):
+        if self._ent != ent:
+            return
+        # keep the values so the instance still works if it's re-added elsewhere.
+        if (values := self._store.free(ent)) is not None:
+            self._pending = values
+        self._ent = None
+
+    @classmethod
+    def column(cls, name: str):
+        return cls._store.column(name)
+
+    @classmethod
+    def entities(cls):
+        return cls._store.active()
+
+    def should_save(self) -> bool:
+        return True
+
+    def save_name(self) -> str:
+        return str(self.__class__.__name__)
+
+    def export(self):
+        return {name: getattr(self, name) for name in self._fields}
+
+    def save_stamp(self):
+        # column writes bypass the instance, so compare the values themselves.
+        return tuple(getattr(self, name) for name in self._fields)
+
+    @classmethod
+    def deserialize(cls, data: typing.Any, ent: Entity):
+        return cls(**data)
+
+    def at_post_deserialize(self, ent):
+        pass
+
+    def clone(self, deep=None):
+        return self.__class__(**self.export())
+
+
+class _ColumnField:
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if obj._ent is None:
+            return obj._pending[self.name]
+        store = obj._store
+        return store.columns[self.name][store.slots[obj._ent]].item()
+
+    def __set__(self, obj, value):
+        if obj._ent is None:
+            obj._pending[self.name] = value
+            return
+        store = obj._store
+        store.columns[self.name][store.slots[obj._ent]] = value
@@ -2,6 +2,7 @@ from typing import List, Optional
 import snekmud
 import mudforge
 from snekmud import exceptions as ex
+from snekmud.sessions import session_for
 
 class MetaCommand(type):
     def __repr__(cls):
@@ -194,7 +195,6 @@ class EntityCommandHandler(BaseCommandHandler):
 
     async def generate_kwargs(self):
         out = {"entity": self.owner.entity}
-        if (sess := snekmud.WORLD.try_component(self.owner.entity, snekmud.COMPONENTS["HasSession"])):
-            if sess.session:
-                out.update({"session": sess.session, "account": sess.session.account})
+        if (sess := session_for(self.owner.entity)):
+            out.update({"session": sess, "account": sess.account})
         return out
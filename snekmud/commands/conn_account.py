@@ -4,6 +4,7 @@ import snekmud
 from .base import Command, ConnectionCommandHandler
 from snekmud.exceptions import CommandError
 from snekmud.db.accounts.models import Account
+from snekmud.db.roster import find_character
 
 
 class ConnectionAccountCmdHandler(ConnectionCommandHandler):
@@ -23,6 +24,6 @@ class Play(_AccountCommand):
             raise CommandError("Play who?")
         if not (self.connection and (acc := self.connection.account)):
             raise CommandError("Must be logged in to play a character!")
-        if not (found := acc.characters.filter(name__iexact=self.args).first()):
+        if not (found := find_character(acc.id, self.args)):
             raise CommandError("That character is not on your account!")
         await self.connection.create_or_join_gamesession(found.id)
\ No newline at end of file
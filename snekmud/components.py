@@ -9,7 +9,9 @@ import sys
 from mudforge.utils import lazy_property
 from mudrich.evennia import EvenniaToRich, strip_ansi
 import snekmud
-from snekmud.serialize import deserialize_entity, serialize_entity
+from snekmud.serialize import deserialize_entity, serialize_entity_cached, clone_component, subtree_stamp
+from snekmud.stats import invalidate_stats
+from snekmud.sessions import bind_session, unbind_session, session_for, add_listener, remove_listener
 
 from snekmud.typing import Entity, GridCoordinates, SpaceCoordinates
 
@@ -17,6 +19,10 @@ from snekmud.typing import Entity, GridCoordinates, SpaceCoordinates
 @dataclass_json
 @dataclass
 class _Save:
+    # Set this on subclasses whose deserialize() doesn't depend on the entity and whose
+    # fields hold no entity references, so one decoded instance can be cloned for every
+    # entity spawned from a template. See snekmud.serialize.build_template.
+    clonable = False
 
     def should_save(self) -> bool:
         return True
@@ -34,6 +40,9 @@ class _Save:
     def at_post_deserialize(self, ent):
         pass
 
+    def clone(self, deep: typing.Optional[typing.Iterable[str]] = None):
+        return clone_component(self, deep)
+
 @dataclass_json
 @dataclass
 class _NoSave(_Save):
@@ -41,6 +50,9 @@ class _NoSave(_Save):
     def should_save(self) -> bool:
         return False
 
+    def save_stamp(self):
+        return None
+
 
 @dataclass_json
 @dataclass
@@ -63,12 +75,14 @@ class IsPersistent(_NoSave):
 @dataclass_json
 @dataclass
 class MetaTypes(_Save):
+    clonable = True
     types: list[str] = field(default_factory=list)
 
 
 @dataclass_json
 @dataclass
 class Prototype(_Save):
+    clonable = True
     module_name: str = ""
     prototype: str = ""
 
@@ -88,6 +102,7 @@ class PlayerCharacter(_Save):
 @dataclass_json
 @dataclass
 class NPC(_Save):
+    clonable = True
     pass
 
 
@@ -106,6 +121,7 @@ class InInventory(_NoSave):
 @dataclass_json
 @dataclass
 class WearSlots(_Save):
+    clonable = True
     slots: list[str] = field(default_factory=list)
 
 
@@ -116,6 +132,12 @@ class Equipped(_NoSave):
     category: str = None
     slot: str = None
 
+    def at_world_add(self, ent):
+        invalidate_stats(self.holder)
+
+    def at_world_remove(self, ent):
+        invalidate_stats(self.holder)
+
 
 @dataclass_json
 @dataclass
@@ -126,7 +148,10 @@ class Inventory(_Save):
         return bool(self.inventory)
 
     def export(self):
-        return [serialize_entity(e) for e in self.inventory]
+        return [serialize_entity_cached(e) for e in self.inventory if snekmud.WORLD.entity_exists(e)]
+
+    def save_stamp(self):
+        return tuple((e, subtree_stamp(e)) for e in self.inventory if snekmud.WORLD.entity_exists(e))
 
     @classmethod
     def deserialize(cls, data: typing.Any, ent: Entity):
@@ -147,7 +172,12 @@ class Equipment(_Save):
         return bool(self.equipment)
 
     def export(self):
-        return [(v.category, k, serialize_entity(v.item)) for k, v in self.equipment.items()]
+        return [(v.category, k, serialize_entity_cached(v.item)) for k, v in self.equipment.items()
+                if snekmud.WORLD.entity_exists(v.item)]
+
+    def save_stamp(self):
+        return tuple((v.category, k, v.item, subtree_stamp(v.item)) for k, v in self.equipment.items()
+                     if snekmud.WORLD.entity_exists(v.item))
 
     @classmethod
     def deserialize(cls, data: typing.Any, ent: Entity):
@@ -233,6 +263,12 @@ class _ModBase(_Save):
         elif isinstance(check, str):
             return snekmud.MODIFIERS_NAMES[cls.category()].get(check, None)
 
+    def at_world_add(self, ent):
+        invalidate_stats(ent)
+
+    def at_world_remove(self, ent):
+        invalidate_stats(ent)
+
 
 @dataclass_json
 @dataclass
@@ -242,6 +278,9 @@ class _SingleModifier(_ModBase):
     def export(self):
         return self.modifier.modifier_id
 
+    def save_stamp(self):
+        return self.modifier.modifier_id if self.modifier else None
+
     @classmethod
     def deserialize(cls, data: typing.Any, ent):
         if (found := cls.find(data)):
@@ -258,6 +297,7 @@ class _SingleModifier(_ModBase):
 @dataclass
 class _MultiModifiers(_ModBase):
     modifiers: dict[str, typing.Any] = field(default_factory=dict)
+    ids: set[int] = field(default_factory=set)
 
     def should_save(self) -> bool:
         return bool(self.modifiers)
@@ -265,19 +305,51 @@ class _MultiModifiers(_ModBase):
     def export(self):
         return list(self.modifiers.keys())
 
+    def save_stamp(self):
+        return tuple(self.modifiers)
+
     @classmethod
     def deserialize(cls, data: typing.Any, ent):
         o = cls()
         for i in data:
             if (found := cls.find(i)):
-                m = found(ent)
-                o.modifiers[str(m)] = m
+                o.add_modifier(found(ent))
+        return o
 
     def all(self):
-        if len(self.modifiers):
-            list(self.modifiers.values())
-        else:
-            return []
+        return list(self.modifiers.values())
+
+    def add_modifier(self, m: "Modifier"):
+        """
+        Store a Modifier instance and index its owner as a holder of it.
+        """
+        self.modifiers[str(m)] = m
+        self.ids.add(m.modifier_id)
+        snekmud.MODIFIERS_HOLDERS[self.category()][m.modifier_id].add(m.owner)
+
+    def remove_modifier(self, name: str) -> typing.Optional["Modifier"]:
+        if (m := self.modifiers.pop(name, None)):
+            self.ids.discard(m.modifier_id)
+            snekmud.MODIFIERS_HOLDERS[self.category()][m.modifier_id].discard(m.owner)
+        return m
+
+    def clear_index(self):
+        """
+        Remove the owner from the holder index.
+        """
+        holders = snekmud.MODIFIERS_HOLDERS[self.category()]
+        for m in self.modifiers.values():
+            holders[m.modifier_id].discard(m.owner)
+
+    def at_world_add(self, ent):
+        super().at_world_add(ent)
+        holders = snekmud.MODIFIERS_HOLDERS[self.category()]
+        for m in self.modifiers.values():
+            holders[m.modifier_id].add(m.owner)
+
+    def at_world_remove(self, ent):
+        super().at_world_remove(ent)
+        self.clear_index()
 
 
 RICH_CACHE = dict()
@@ -286,6 +358,7 @@ RICH_CACHE = dict()
 @dataclass_json
 @dataclass
 class _StringBase(_Save):
+    clonable = True
     color: str
 
     def should_save(self) -> bool:
@@ -336,6 +409,7 @@ class ActionDescription(_StringBase):
 @dataclass_json
 @dataclass
 class ExDescriptions(_Save):
+    clonable = True
     ex_descriptions: list[typing.Tuple[Name, Description]] = field(default_factory=list)
 
     def should_save(self) -> bool:
@@ -357,6 +431,13 @@ class HasSession(_NoSave):
     def __init__(self, session):
         self.session = session
 
+    def at_world_add(self, ent):
+        if self.session:
+            bind_session(ent, self.session)
+
+    def at_world_remove(self, ent):
+        unbind_session(ent, self.session)
+
 
 @dataclass_json
 @dataclass
@@ -381,9 +462,8 @@ class HasCmdHandler(_NoSave):
         await self.cmdhandler.parse(data)
 
     def send(self, **kwargs):
-        if (sess := snekmud.WORLD.try_component(self.entity, snekmud.COMPONENTS["HasSession"])):
-            if sess.session:
-                sess.session.handler.send(**kwargs)
+        if (sess := session_for(self.entity)):
+            sess.handler.send(**kwargs)
 
     def at_post_deserialize(self, ent):
         self.entity = ent
@@ -391,14 +471,27 @@ class HasCmdHandler(_NoSave):
 
 class Receiver(_NoSave):
     entity: Entity = None
+    # Set this on subclasses whose receive() does something besides sending to a session.
+    # Entities without a session will then be given messages.
+    listener = False
+    # Set this on subclasses whose receive() accepts a utils.LazyMessage in place of a str.
+    # Messages for entities without a session are then only rendered if str() is called.
+    lazy_messages = False
 
     def at_post_deserialize(self, ent):
         self.entity = ent
 
+    def at_world_add(self, ent):
+        self.entity = ent
+        if self.listener:
+            add_listener(ent)
+
+    def at_world_remove(self, ent):
+        remove_listener(ent)
+
     def receive(self, msg: str, from_ent: Entity, msg_type=None, **kwargs):
         self.send(msg)
 
     def send(self, msg):
-        if (sess := snekmud.WORLD.try_component(self.entity, snekmud.COMPONENTS["HasSession"])):
-            if sess.session:
-                sess.session.handler.send(line=msg)
\ No newline at end of file
+        if (sess := session_for(self.entity)):
+            sess.handler.send(line=msg)
\ No newline at end of file
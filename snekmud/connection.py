@@ -1,8 +1,8 @@
 from mudforge.net.game_conn import GameConnection as OldConn
 import snekmud
 from snekmud.db.accounts.models import Account
-from snekmud.db.gamesessions.models import GameSession
 from snekmud.db.players.models import PlayerCharacter
+from snekmud.sessions import gamesession_for, load_gamesessions
 from snekmud.exceptions import CommandError
 import time
 from mudrich.evennia import EvenniaToRich
@@ -32,7 +32,8 @@ class GameConnection(OldConn):
         if (cmd_name := data.pop("cmdhandler", None)):
             await out.set_cmdhandler(cmd_name)
         if (sess_id := data.pop("session")):
-            sess = GameSession.objects.get(id=sess_id)
+            if not (sess := gamesession_for(sess_id)):
+                sess = load_gamesessions([sess_id])[sess_id]
             await sess.handler.add_connection(out)
         return out
 
@@ -127,10 +128,12 @@ class GameConnection(OldConn):
             await sess.handler.add_connection(self)
             await self.at_bind_gamesession()
 
-        if not (player := PlayerCharacter.objects.filter(id=character_id).first()):
+        try:
+            player = PlayerCharacter.objects.get(id=character_id)
+        except PlayerCharacter.DoesNotExist:
             raise CommandError(f"Player ID {character_id} not found.")
-        if (gsess := GameSession.objects.filter(id=player).first()):
-            if gsess.account != self.account:
+        if (gsess := gamesession_for(player.id)):
+            if gsess.account_id != self.account.id:
                 raise CommandError(f"This character is being used by a different account!")
             if await self.can_join_session(gsess):
                 await do_bind(gsess)
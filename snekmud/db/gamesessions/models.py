@@ -2,6 +2,7 @@ from django.db import models
 from snekmud.db.idmap import models as idmodels
 from mudforge import CLASSES
 from mudforge.utils import lazy_property, utcnow
+from snekmud.sessions import register_gamesession, unregister_gamesession
 import time
 
 
@@ -14,3 +15,11 @@ class GameSession(idmodels.IdMapModel):
     @lazy_property
     def handler(self):
         return CLASSES["GameSessionHandler"](self)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        register_gamesession(self)
+
+    def delete(self, *args, **kwargs):
+        unregister_gamesession(self)
+        return super().delete(*args, **kwargs)
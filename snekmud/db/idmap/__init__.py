@@ -1,5 +1,5 @@
 from .version import __version__, __version_info__
 
-from .functions import flush
+from .functions import flush, cache_stats
 
 default_app_config = 'idmap.apps.IdMapConfig'
@@ -7,3 +7,8 @@ def flush(db=None):
     for model in IdMapModel.__subclasses__():
         model.flush_instance_cache(db=db, flush_sub=True)
     post_flush.send(IdMapModel, db=db)
+
+
+def cache_stats():
+    from .tls import cache_stats
+    return cache_stats()
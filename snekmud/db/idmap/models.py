@@ -101,8 +101,7 @@ class IdMapModel(models.Model, metaclass=IdMapModelBase):
             inst = cls(*args, **kwargs)
             inst._state.adding = False
             inst._state.db = db
-            cls.cache_instance(inst)
-            return inst
+            return cls.cache_instance_if_absent(inst)
 
         # depending on the arguments, we might not be able to infer the PK
         # in that case, we create a new instance
@@ -182,6 +181,17 @@ class IdMapModel(models.Model, metaclass=IdMapModelBase):
         if pk is not None:
             tls.cache_instance(cls, instance)
 
+    @classmethod
+    def cache_instance_if_absent(cls, instance):
+        """
+        Method to store an instance in the cache, unless another instance
+        with the same pk already is. Returns the cached instance.
+        """
+        pk = instance._get_pk_val()
+        if pk is None:
+            return instance
+        return tls.get_or_cache_instance(cls, instance)
+
     @classmethod
     def flush_cached_instance(cls, instance):
         """
@@ -1,10 +1,12 @@
 """
 Signals are used to automatically flush the idmap cache on finish request,
-migrate / syncdb and instance deletion, and to make sure to catch cascades
+migrate / syncdb and instance deletion, and to make sure to catch cascades.
+Changing an IDMAP_ setting (as override_settings does) makes the cache read
+them again.
 """
 
 from django.dispatch import Signal, receiver
-from django.core.signals import request_finished
+from django.core.signals import request_finished, setting_changed
 from django.db.models.signals import pre_delete, post_migrate
 
 
@@ -29,3 +31,13 @@ def flush_cached_instance(sender, instance, **kwargs):
     from .models import IdMapModel
     if issubclass(sender, IdMapModel):
         sender.flush_cached_instance(instance)
+
+
+@receiver(setting_changed)
+def reset_idmap_config(setting, **kwargs):
+    """
+    Makes the cache pick up changed IDMAP_ settings
+    """
+    if setting.startswith("IDMAP_"):
+        from .tls import reset_config
+        reset_config()
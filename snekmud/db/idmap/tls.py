@@ -1,73 +1,235 @@
 """
-Thread local storage for instances cache
+Storage for the instances cache.
+
+By default each thread keeps its own cache in thread local storage. With the Django setting
+IDMAP_CACHE_MODE = "shared", one cache is shared by every thread in the process and guarded by
+a lock, so threads reading the same rows get the same instances.
+
+IDMAP_MAX_STRONG_REFS caps how many instances each `use_strong_refs` model (per database, for
+`multi_db` models) holds on to. The least recently used are evicted down to weak references,
+so an evicted instance that is still in use elsewhere keeps its identity.
 """
 
 import threading
+from collections import defaultdict, OrderedDict, Counter
+from contextlib import nullcontext
+from functools import partial
 from weakref import WeakValueDictionary
-from collections import defaultdict
 
 
 _tls = threading.local()
 
+_shared = defaultdict(dict)
+_lock = threading.RLock()
 
-def get_cache(cls, flush=False):
+# hits, misses and evictions, one Counter per thread so counting needs no lock. cache_stats()
+# adds them up.
+_all_stats = list()
+
+
+class _Config:
+    """
+    The cache settings, read from Django's once by _config().
+    """
+
+    def __init__(self, mode, max_strong_refs):
+        self.mode = mode
+        self.shared = mode == "shared"
+        self.max_strong_refs = max_strong_refs
+        self.guard = _lock if self.shared else nullcontext()
+
+
+_current = None
+
+
+def _config():
+    global _current
+    if _current is None:
+        from django.conf import settings
+        _current = _Config(getattr(settings, "IDMAP_CACHE_MODE", "thread"),
+                           getattr(settings, "IDMAP_MAX_STRONG_REFS", None))
+    return _current
+
+
+def reset_config():
+    """
+    Read the settings again on next use. Caches already made keep their old size limit.
+    """
+    global _current
+    _current = None
+
+
+def _guard():
+    return _config().guard
+
+
+def _stats():
     try:
-        cls_dict = _tls.idmap_cache
+        return _tls.idmap_stats
+    except AttributeError:
+        _tls.idmap_stats = stats = Counter(hits=0, misses=0, evictions=0)
+        with _lock:
+            _all_stats.append(stats)
+        return stats
+
+
+class _BoundedCache:
+    """
+    A dict of pk: instance holding strong references to the `maxsize` most recently used
+    instances, and weak references to the rest.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.recent = OrderedDict()
+        self.evicted = WeakValueDictionary()
+
+    def __getitem__(self, pk):
+        try:
+            self.recent.move_to_end(pk)
+            return self.recent[pk]
+        except KeyError:
+            instance = self.evicted.pop(pk)
+        self[pk] = instance
+        return instance
+
+    def __setitem__(self, pk, instance):
+        self.evicted.pop(pk, None)
+        self.recent[pk] = instance
+        self.recent.move_to_end(pk)
+        while len(self.recent) > self.maxsize:
+            old_pk, old = self.recent.popitem(last=False)
+            self.evicted[old_pk] = old
+            _stats()["evictions"] += 1
+
+    def __delitem__(self, pk):
+        found = self.recent.pop(pk, None) is not None
+        found = self.evicted.pop(pk, None) is not None or found
+        if not found:
+            raise KeyError(pk)
+
+    def __contains__(self, pk):
+        return pk in self.recent or pk in self.evicted
+
+    def __len__(self):
+        return len(self.recent) + len(self.evicted)
+
+    def get(self, pk, default=None):
+        try:
+            return self[pk]
+        except KeyError:
+            return default
+
+
+def _class_caches():
+    if _config().shared:
+        return _shared
+    try:
+        return _tls.idmap_cache
     except AttributeError:
         _tls.idmap_cache = cls_dict = defaultdict(dict)
+        return cls_dict
 
-    while cls._meta.proxy:
-        cls = cls.__mro__[1]
 
-    # using defaultdict.get does not create the key if it does not exist
-    cache = cls_dict.get(cls)
-    if flush is False and cache is not None:
-        return cache
+def _new_cache_func(cls):
+    if not cls._meta.use_strong_refs:
+        return WeakValueDictionary
+    maxsize = _config().max_strong_refs
+    return dict if maxsize is None else partial(_BoundedCache, maxsize)
+
+
+def get_cache(cls, flush=False):
+    with _guard():
+        cls_dict = _class_caches()
+
+        while cls._meta.proxy:
+            cls = cls.__mro__[1]
 
-    # reset is not False
-    # reset = None or True => clear all caches from all dbs
-    # reset = database name => clear only this database's cache
-    new_cache_func = dict if cls._meta.use_strong_refs else WeakValueDictionary
-    if flush in (None, True) or cache is None or not cls._meta.multi_db:
-        if cls._meta.multi_db:
-            cache = defaultdict(new_cache_func)
+        # using defaultdict.get does not create the key if it does not exist
+        cache = cls_dict.get(cls)
+        if flush is False and cache is not None:
+            return cache
+
+        # reset is not False
+        # reset = None or True => clear all caches from all dbs
+        # reset = database name => clear only this database's cache
+        new_cache_func = _new_cache_func(cls)
+        if flush in (None, True) or cache is None or not cls._meta.multi_db:
+            if cls._meta.multi_db:
+                cache = defaultdict(new_cache_func)
+            else:
+                cache = new_cache_func()
+            cls_dict[cls] = cache
         else:
-            cache = new_cache_func()
-        cls_dict[cls] = cache
-    else:
-        # flush is true, cls._meta.multi_db is True and cache is not None
-        cache[flush] = new_cache_func()
-    return cache
+            # flush is true, cls._meta.multi_db is True and cache is not None
+            cache[flush] = new_cache_func()
+        return cache
 
 
-def cache_instance(cls, instance):
+def _db_cache(cls, db):
     cache = get_cache(cls)
-    if cls._meta.multi_db:
-        cache[instance._state.db][instance.pk] = instance
-    else:
+    return cache[db] if cls._meta.multi_db else cache
+
+
+def cache_instance(cls, instance):
+    with _guard():
+        _db_cache(cls, instance._state.db)[instance.pk] = instance
+
+
+def get_or_cache_instance(cls, instance):
+    """
+    Cache instance unless another instance of the same row already is, and return whichever
+    is cached. Used when loading rows, so that threads loading the same row at once still end
+    up with one instance.
+    """
+    with _guard():
+        cache = _db_cache(cls, instance._state.db)
+        cached = cache.get(instance.pk)
+        if cached is not None:
+            return cached
         cache[instance.pk] = instance
+        return instance
 
 
 def get_cached_instance(cls, pk, db=None):
-    cache = get_cache(cls)
-    try:
-        if cls._meta.multi_db:
-            assert db is not None, \
-                'A database should be provided to retrieve an instance of a ' \
-                'model set with multi_db=True'
-            return cache[db][pk]
-        else:
-            return cache[pk]
-    except KeyError:
-        return None
+    if cls._meta.multi_db:
+        assert db is not None, \
+            'A database should be provided to retrieve an instance of a ' \
+            'model set with multi_db=True'
+    with _guard():
+        try:
+            instance = _db_cache(cls, db)[pk]
+        except KeyError:
+            _stats()["misses"] += 1
+            return None
+        _stats()["hits"] += 1
+        return instance
 
 
 def flush_cached_instance(cls, instance):
-    cache = get_cache(cls)
-    try:
-        if cls._meta.multi_db:
-            del cache[instance._state.db][instance.pk]
-        else:
-            del cache[instance.pk]
-    except KeyError:
-        pass
+    with _guard():
+        try:
+            del _db_cache(cls, instance._state.db)[instance.pk]
+        except KeyError:
+            pass
+
+
+def cache_stats():
+    """
+    Report on the instance cache: hits, misses and evictions since startup, and how many
+    instances are cached (in this thread's cache, unless the cache is shared).
+
+    Returns:
+        dict: The counters, plus `mode` and `size`.
+    """
+    with _lock:
+        totals = sum(_all_stats, Counter())
+    with _guard():
+        size = 0
+        for cache in _class_caches().values():
+            if isinstance(cache, defaultdict):
+                size += sum(len(db_cache) for db_cache in cache.values())
+            else:
+                size += len(cache)
+    return {"mode": _config().mode, "hits": totals["hits"], "misses": totals["misses"],
+            "evictions": totals["evictions"], "size": size}
@@ -0,0 +1,91 @@
+"""
+An in-memory read model of which characters each account has, for account menus, who lists
+and admin tools.
+
+ACCOUNT_CHARACTERS maps account id to {character id: CharacterEntry}. An account's characters
+are read from the database the first time they're asked for (prefetch_accounts() does this for
+many accounts in one query) and afterwards kept current by PlayerCharacter's post_save and
+post_delete signals. Live sessions come from snekmud.sessions, so listing an account's
+characters and whether each is being played never touches the database once loaded.
+
+Queryset.update() and bulk_update() don't send signals; they must not be used to change the
+fields held here (id, name, account, approved).
+
+install() is called by hooks.setup_django() after django.setup().
+"""
+import typing
+from dataclasses import dataclass
+
+from django.db.models.signals import post_save, post_delete
+from snekmud import ACCOUNT_CHARACTERS
+from snekmud.sessions import gamesession_for
+
+_FIELDS = ("id", "name", "account_id", "approved")
+
+
+@dataclass(slots=True)
+class CharacterEntry:
+    id: int
+    name: str
+    account_id: int
+    approved: bool
+
+    @property
+    def session(self) -> typing.Optional[typing.Any]:
+        return gamesession_for(self.id)
+
+
+def prefetch_accounts(account_ids: typing.Iterable[int]):
+    """
+    Load the characters of every account in account_ids that isn't loaded yet, in one query.
+    """
+    from snekmud.db.players.models import PlayerCharacter
+    if not (missing := {a for a in account_ids if a not in ACCOUNT_CHARACTERS}):
+        return
+    for account_id in missing:
+        ACCOUNT_CHARACTERS[account_id] = dict()
+    rows = PlayerCharacter.objects.filter(account_id__in=missing).order_by("id").values_list(*_FIELDS)
+    for row in rows:
+        entry = CharacterEntry(*row)
+        ACCOUNT_CHARACTERS[entry.account_id][entry.id] = entry
+
+
+def characters_for(account_id: int) -> list[CharacterEntry]:
+    if account_id not in ACCOUNT_CHARACTERS:
+        prefetch_accounts((account_id,))
+    return sorted(ACCOUNT_CHARACTERS[account_id].values(), key=lambda entry: entry.id)
+
+
+def find_character(account_id: int, name: str) -> typing.Optional[CharacterEntry]:
+    name = name.lower()
+    for entry in characters_for(account_id):
+        if entry.name.lower() == name:
+            return entry
+    return None
+
+
+def forget_account(account_id: int):
+    ACCOUNT_CHARACTERS.pop(account_id, None)
+
+
+def _character_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not update_fields.intersection(("name", "account", "approved")):
+        return
+    entry = CharacterEntry(*(getattr(instance, field) for field in _FIELDS))
+    for account_id, entries in ACCOUNT_CHARACTERS.items():
+        if account_id != entry.account_id:
+            # in case it moved to another account.
+            entries.pop(entry.id, None)
+    if (entries := ACCOUNT_CHARACTERS.get(entry.account_id, None)) is not None:
+        entries[entry.id] = entry
+
+
+def _character_deleted(sender, instance, **kwargs):
+    if (entries := ACCOUNT_CHARACTERS.get(instance.account_id, None)) is not None:
+        entries.pop(instance.id, None)
+
+
+def install():
+    from snekmud.db.players.models import PlayerCharacter
+    post_save.connect(_character_saved, sender=PlayerCharacter, dispatch_uid="snekmud.db.roster.save")
+    post_delete.connect(_character_deleted, sender=PlayerCharacter, dispatch_uid="snekmud.db.roster.delete")
@@ -0,0 +1,118 @@
+"""
+SQLite performance profiles and connection routing for the game process.
+
+Each new SQLite connection gets the PRAGMAs of the profile named by the Django setting
+SQLITE_PROFILE. The "performance" profile switches the database to WAL journaling, which lets
+readers and the writer work at the same time, and relaxes fsyncs to synchronous=NORMAL (a crash
+may lose the last few commits, but can't corrupt the database).
+
+With SQLITE_READ_CONNECTIONS enabled, a second alias (SQLITE_READ_ALIAS) is opened on the same
+file with query_only set, and ReadWriteRouter sends reads made from threads other than the main
+one there. All writes go through "default", the writer connection. Django keeps one
+connection per alias per thread, so each worker thread gets its own read connection.
+
+install() is called by hooks.setup_django() before django.setup().
+"""
+import threading
+
+from django.db.backends.signals import connection_created
+
+SQLITE_PROFILES = {
+    # SQLite's own defaults.
+    "default": {},
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        # negative values are in KiB.
+        "cache_size": -64 * 1024,
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    },
+    # WAL for concurrency, but fsync on every commit.
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+}
+
+# These change the database file rather than the connection, so only the writer sets them.
+_WRITER_ONLY = ("journal_mode",)
+
+
+def _is_sqlite(db: dict) -> bool:
+    return db.get("ENGINE", "").endswith("sqlite3")
+
+
+def pragmas_for(alias: str, profile: str) -> list[str]:
+    """
+    The statements to run on a new connection for alias, under profile.
+    """
+    from django.conf import settings
+    read_alias = getattr(settings, "SQLITE_READ_ALIAS", "read")
+    out = list()
+    for key, value in SQLITE_PROFILES[profile].items():
+        if alias == read_alias and key in _WRITER_ONLY:
+            continue
+        out.append(f"PRAGMA {key} = {value}")
+    if alias == read_alias:
+        out.append("PRAGMA query_only = ON")
+    return out
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    from django.conf import settings
+    profile = getattr(settings, "SQLITE_PROFILE", "default")
+    with connection.cursor() as cursor:
+        for statement in pragmas_for(connection.alias, profile):
+            cursor.execute(statement)
+
+
+class ReadWriteRouter:
+    """
+    Sends reads from worker threads to the read alias, and all writes to "default".
+    """
+
+    def _read_alias(self):
+        from django.conf import settings
+        if not getattr(settings, "SQLITE_READ_CONNECTIONS", False):
+            return None
+        alias = getattr(settings, "SQLITE_READ_ALIAS", "read")
+        return alias if alias in settings.DATABASES else None
+
+    def db_for_read(self, model, **hints):
+        if threading.current_thread() is threading.main_thread():
+            return "default"
+        return self._read_alias() or "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # both aliases are the same database.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != self._read_alias()
+
+
+def install(settings):
+    """
+    Add the read alias and router to settings if SQLITE_READ_CONNECTIONS is enabled, and apply
+    SQLITE_PROFILE to every new SQLite connection. Must run before django.setup().
+    """
+    connection_created.connect(configure_connection, dispatch_uid="snekmud.db.tuning")
+    if not getattr(settings, "SQLITE_READ_CONNECTIONS", False):
+        return
+    default = settings.DATABASES.get("default", dict())
+    if not _is_sqlite(default):
+        return
+    alias = getattr(settings, "SQLITE_READ_ALIAS", "read")
+    if alias not in settings.DATABASES:
+        settings.DATABASES[alias] = {**default, "TEST": {"MIRROR": "default"}}
+    router = "snekmud.db.tuning.ReadWriteRouter"
+    if router not in settings.DATABASE_ROUTERS:
+        settings.DATABASE_ROUTERS = [*settings.DATABASE_ROUTERS, router]
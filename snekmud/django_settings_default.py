@@ -16,6 +16,17 @@ DATABASES = {
     }
 }
 
+# PRAGMAs applied to each new SQLite connection. One of the profiles in
+# snekmud.db.tuning.SQLITE_PROFILES: "default" (SQLite's defaults), "performance"
+# (WAL, synchronous=NORMAL, larger caches) or "safe" (WAL, synchronous=FULL).
+SQLITE_PROFILE = "default"
+
+# If True, reads from threads other than the main one go through a query-only
+# connection to the same database, under this alias, leaving "default" as the
+# sole writer. Best combined with a WAL profile.
+SQLITE_READ_CONNECTIONS = False
+SQLITE_READ_ALIAS = "read"
+
 # CHANGE THIS IN PRODUCTION!
 SECRET_KEY = "snek"
 
@@ -35,6 +46,14 @@ INSTALLED_APPS = [
     "snekmud.db.gamesessions"
 ]
 
+# The idmap instance cache is per-thread by default. Set this to "shared" to share one
+# cache, guarded by a lock, between all threads (such as when saving in worker threads).
+IDMAP_CACHE_MODE = "thread"
+
+# Max number of instances kept cached per strong-ref idmap model. None is unlimited.
+# Least recently used instances beyond this are only weakly referenced.
+IDMAP_MAX_STRONG_REFS = None
+
 AUTH_USER_MODEL = "accounts.Account"
 
 PASSWORD_HASHERS = [
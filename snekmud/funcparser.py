@@ -50,7 +50,7 @@ from server.conf import settings
 import logging
 from mudforge.utils import make_iter
 from snekmud.utils import callables_from_module, variable_from_module, pad, crop, justify, safe_convert_to_types
-from snekmud import GETTERS, OPERATIONS, COMPONENTS, WORLD
+from snekmud import GETTERS, GETTER_FUNCS, OPERATIONS, COMPONENTS, WORLD
 
 from .verb_conjugation.conjugate import verb_actor_stance_components
 from .verb_conjugation.pronouns import pronoun_to_viewpoints
@@ -1135,14 +1135,13 @@ def funcparser_callable_you(
             caller = mapping.get(args[0])
         except KeyError:
             pass
-    print(f"CALLER: {caller}, RECEIVER: {receiver}")
     if not (caller and receiver):
         raise ParsingError("No caller or receiver supplied to $you callable.")
 
     capitalize = bool(capitalize)
     if caller == receiver:
         return "You" if capitalize else "you"
-    return GETTERS["GetDisplayName"](receiver, caller).execute()
+    return GETTER_FUNCS["GetDisplayName"](receiver, caller)
 
 
 def funcparser_callable_you_capitalize(
@@ -1295,6 +1294,16 @@ def funcparser_callable_pronoun(*args, caller=None, receiver=None, capitalize=Fa
     if not args:
         return ""
 
+    pronoun_1st_or_2nd_person, pronoun_3rd_person = _pronoun_forms(
+        args, GETTER_FUNCS["Gender"](receiver, caller), capitalize, kwargs
+    )
+    return pronoun_1st_or_2nd_person if caller == receiver else pronoun_3rd_person
+
+
+def _pronoun_forms(args, gender, capitalize, kwargs):
+    """
+    Map the args of a $pron call to its (1st/2nd person, 3rd person) forms.
+    """
     pronoun, *options = args
     # options is either multiple args or a space-separated string
     if len(options) == 1:
@@ -1305,8 +1314,8 @@ def funcparser_callable_pronoun(*args, caller=None, receiver=None, capitalize=Fa
     default_gender = "neutral"
     default_viewpoint = "2nd person"
 
-    if (gen := GETTERS["Gender"](receiver, caller).execute()):
-        default_gender = gen
+    if gender:
+        default_gender = gender
 
     if "viewpoint" in kwargs:
         # passed into FuncParser initialization
@@ -1324,7 +1333,7 @@ def funcparser_callable_pronoun(*args, caller=None, receiver=None, capitalize=Fa
         pronoun_1st_or_2nd_person = pronoun_1st_or_2nd_person.capitalize()
         pronoun_3rd_person = pronoun_3rd_person.capitalize()
 
-    return pronoun_1st_or_2nd_person if caller == receiver else pronoun_3rd_person
+    return pronoun_1st_or_2nd_person, pronoun_3rd_person
 
 
 def funcparser_callable_pronoun_capitalize(
@@ -1389,3 +1398,155 @@ ACTOR_STANCE_CALLABLES = {
     "pron": funcparser_callable_pronoun,
     "Pron": funcparser_callable_pronoun_capitalize,
 }
+
+
+# Pre-evaluating actor-stance strings. The output of an actor-stance callable only depends on
+# whether the receiver is its subject (the caller, or the mapped entity for $you(key)), so a
+# message can be parsed once into literal text and two-sided branches, and each receiver then
+# just picks a side. Only $you's display name (and $pron's gender, if the Gender getter says
+# it is viewer_dependent) still needs the receiver, and is resolved per receiver.
+
+_STANCE_MARK = "\x00"
+
+
+class _NotHoistable(ParsingError):
+    """
+    The string can't be pre-evaluated, such as when actor-stance calls are nested.
+    """
+
+
+class _Stance:
+    """
+    One actor-stance call: what its subject sees, and what everyone else sees. `theirs` is
+    either a string or a callable taking the receiver.
+    """
+    __slots__ = ("subject", "mine", "theirs")
+
+    def __init__(self, subject, mine, theirs):
+        self.subject = subject
+        self.mine = mine
+        self.theirs = theirs
+
+    def render(self, receiver):
+        if receiver == self.subject:
+            return self.mine
+        theirs = self.theirs
+        return theirs if isinstance(theirs, str) else theirs(receiver)
+
+
+def _stance_args(args, kwargs):
+    for arg in (*args, *kwargs.values()):
+        if isinstance(arg, str) and _STANCE_MARK in arg:
+            raise _NotHoistable("Nested actor-stance call.")
+
+
+def _compile_you(*args, caller=None, mapping=None, capitalize=False, stances=None, **kwargs):
+    _stance_args(args, kwargs)
+    if args and mapping:
+        caller = mapping.get(args[0])
+    if not caller:
+        raise ParsingError("No caller or receiver supplied to $you callable.")
+
+    def theirs(receiver):
+        return GETTER_FUNCS["GetDisplayName"](receiver, caller)
+
+    stances.append(_Stance(caller, "You" if capitalize else "you", theirs))
+    return _STANCE_MARK
+
+
+def _compile_you_capitalize(*args, capitalize=True, **kwargs):
+    return _compile_you(*args, capitalize=capitalize, **kwargs)
+
+
+def _compile_conjugate(*args, caller=None, stances=None, **kwargs):
+    _stance_args(args, kwargs)
+    if not args:
+        return ""
+    if not caller:
+        raise ParsingError("No caller/receiver supplied to $conj callable")
+    stances.append(_Stance(caller, *verb_actor_stance_components(args[0])))
+    return _STANCE_MARK
+
+
+def _compile_pronoun(*args, caller=None, capitalize=False, stances=None, **kwargs):
+    _stance_args(args, kwargs)
+    if not args:
+        return ""
+    if not caller:
+        raise ParsingError("No caller/receiver supplied to $pron callable")
+    get_gender = GETTER_FUNCS["Gender"]
+    mine, theirs = _pronoun_forms(args, get_gender(caller, caller), capitalize, kwargs)
+    if getattr(GETTERS.get("Gender"), "viewer_dependent", False):
+
+        def theirs(receiver):
+            return _pronoun_forms(args, get_gender(receiver, caller), capitalize, kwargs)[1]
+
+    stances.append(_Stance(caller, mine, theirs))
+    return _STANCE_MARK
+
+
+def _compile_pronoun_capitalize(*args, capitalize=True, **kwargs):
+    return _compile_pronoun(*args, capitalize=capitalize, **kwargs)
+
+
+_STANCE_COMPILER = FuncParser(
+    {
+        "you": _compile_you,
+        "You": _compile_you_capitalize,
+        "obj": _compile_you,
+        "Obj": _compile_you_capitalize,
+        "conj": _compile_conjugate,
+        "pron": _compile_pronoun,
+        "Pron": _compile_pronoun_capitalize,
+    }
+)
+
+
+class StanceTemplate:
+    """
+    An actor-stance string parsed once per message, which renders the same result as parsing
+    it with ACTOR_STANCE_CALLABLES for each receiver.
+    """
+    __slots__ = ("parts", "stances")
+
+    def __init__(self, parts: list[str], stances: list[_Stance]):
+        self.parts = parts
+        self.stances = stances
+
+    @classmethod
+    def compile(cls, string: str, caller=None, mapping=None):
+        """
+        Pre-evaluate string for caller and mapping.
+
+        Returns:
+            StanceTemplate or None: None if the string can't be pre-evaluated (or fails to
+                parse), in which case it should be parsed per receiver as usual.
+        """
+        if not isinstance(string, str) or _STANCE_MARK in string:
+            return None
+        if _START_CHAR not in string and _ESCAPE_CHAR not in string:
+            return cls([string], [])
+        stances = list()
+        try:
+            result = _STANCE_COMPILER.parse(
+                string, raise_errors=True, caller=caller, mapping=mapping, stances=stances
+            )
+        except Exception:
+            # let the per-receiver parse report it, as it always has.
+            return None
+        parts = result.split(_STANCE_MARK)
+        if len(parts) != len(stances) + 1:
+            return None
+        return cls(parts, stances)
+
+    def render(self, receiver) -> str:
+        if not self.stances:
+            return self.parts[0]
+        if not receiver:
+            raise ParsingError("No caller or receiver supplied to actor-stance callable.")
+        parts = self.parts
+        out = [parts[0]]
+        for i, stance in enumerate(self.stances, 1):
+            out.append(stance.render(receiver))
+            out.append(parts[i])
+        return "".join(out)
@@ -24,6 +24,7 @@ async def part_broad(s: str):
 class GameService(OldGame):
     mod_path = Path("modules")
     save_root = Path("save")
+    autosave = None
 
     async def at_post_module_initial_load(self):
         pass
@@ -74,6 +75,17 @@ class GameService(OldGame):
             await v.load_entities_finalize()
         logging.info("Finished load!")
 
+        self.autosave = CLASSES["autosave"]()
+        self.autosave.start()
+
+    def stop_autosave(self):
+        if self.autosave is not None:
+            self.autosave.stop()
+
+    async def stop(self):
+        self.stop_autosave()
+        await super().stop()
+
     async def game_loop(self):
         pass
 
@@ -83,4 +95,5 @@ class GameService(OldGame):
         m = snekmud.MODULES[ent_id.module_name]
         p = m.prototypes[ent_id.prototype]
         m.entities[ent_id.ent_id] = ent
-        p.entities[ent_id.ent_id] = ent
\ No newline at end of file
+        p.entities[ent_id.ent_id] = ent
+        m.id_allocator.observe(ent_id.prototype, ent_id.ent_id)
\ No newline at end of file
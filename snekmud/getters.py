@@ -1,7 +1,22 @@
+"""
+Getters are classes so that games can override them through GETTER_PATHS. A Getter may also
+define a classmethod fast() taking the same arguments as its constructor and returning what
+execute() would; hooks.load_getters() resolves each Getter into a plain callable in
+snekmud.GETTER_FUNCS, which skips the per-call instance when fast() is safe to use.
+
+Getters that check one subject against many targets may also define batch(subject, targets),
+which returns the targets passing the check. These are resolved into snekmud.GETTER_BATCH.
+
+Getters with `pure = True` are cached while a snekmud.memo.memo_scope() is open.
+
+Gender is looked up once per message for $pron unless it sets `viewer_dependent = True`.
+"""
 from mudforge.utils import make_iter, is_iter
 from snekmud.typing import Entity
-from snekmud import COMPONENTS, WORLD, OPERATIONS, MODULES, GETTERS
+from snekmud import COMPONENTS, WORLD, OPERATIONS, MODULES, GETTERS, GETTER_FUNCS, GETTER_BATCH
 from rich.text import Text
+from snekmud.components import _ModBase
+from snekmud.stats import get_stat
 
 
 class DisplayInRoom:
@@ -12,24 +27,33 @@ class DisplayInRoom:
         self.entity = entity
         self.kwargs = kwargs
 
-    def execute(self):
-        if (long := WORLD.try_component(self.entity, COMPONENTS["RoomDescription"])) and long.plain:
+    @classmethod
+    def fast(cls, viewer, room, entity, **kwargs):
+        if (long := WORLD.try_component(entity, COMPONENTS["RoomDescription"])) and long.plain:
             return long.color
-        name = GETTERS["GetDisplayName"](self.viewer, self.entity).execute()
+        name = GETTER_FUNCS["GetDisplayName"](viewer, entity)
         return f"{name} is here."
 
+    def execute(self):
+        return self.fast(self.viewer, self.room, self.entity, **self.kwargs)
+
 
 class GetEquipment:
+    pure = True
 
     def __init__(self, entity, **kwargs):
         self.entity = entity
         self.kwargs = kwargs
 
-    def execute(self):
-        if (eq := WORLD.try_component(self.entity, COMPONENTS["Equipment"])):
+    @classmethod
+    def fast(cls, entity, **kwargs):
+        if (eq := WORLD.try_component(entity, COMPONENTS["Equipment"])):
             return list(eq.all())
         return []
 
+    def execute(self):
+        return self.fast(self.entity, **self.kwargs)
+
 
 class VisibleEquipment:
 
@@ -38,8 +62,12 @@ class VisibleEquipment:
         self.holder = holder
         self.kwargs = kwargs
 
+    @classmethod
+    def fast(cls, viewer: Entity, holder: Entity, **kwargs):
+        return GETTER_FUNCS["VisibleEntities"](viewer, GETTER_FUNCS["GetEquipment"](holder))
+
     def execute(self):
-        return GETTERS["VisibleEntities"](self.viewer, GETTERS["GetEquipment"](self.holder).execute()).execute()
+        return self.fast(self.viewer, self.holder, **self.kwargs)
 
 
 class VisibleNearbyMeta:
@@ -49,26 +77,26 @@ class VisibleNearbyMeta:
         self.meta_type = meta_type
         self.kwargs = kwargs
 
-    def execute(self):
-        meta_get = GETTERS["GetMetaTypes"]
+    @classmethod
+    def fast(cls, viewer: Entity, meta_type: str = "item", **kwargs):
+        meta_get = GETTER_FUNCS["GetMetaTypes"]
+        get_contents = GETTER_FUNCS["GetContents"]
 
-        def check(ent):
-            if not (meta := meta_get(ent).execute()):
-                return False
-            return self.meta_type in meta.types
+        candidates = list()
+        if (room := GETTER_FUNCS["GetRoomLocation"](viewer)):
+            candidates.extend(x for x in get_contents(room) if x != viewer)
+        candidates.extend(get_contents(viewer))
+        candidates.extend(GETTER_FUNCS["GetEquipment"](viewer))
 
-        con_get = GETTERS["VisibleContents"]
-        out = list()
-        if (room := GETTERS["GetRoomLocation"](self.viewer).execute()):
-            room_contents = con_get(self.viewer, room).execute()
-            room_contents.remove(self.viewer)
-            out.extend(room_contents)
-        out.extend(con_get(self.viewer, self.viewer).execute())
-        out.extend(GETTERS["VisibleEquipment"](self.viewer, self.viewer).execute())
-        return [o for o in out if check(o)]
+        matches = [x for x in candidates if (meta := meta_get(x)) and meta_type in meta.types]
+        return GETTER_FUNCS["VisibleEntities"](viewer, matches, **kwargs)
+
+    def execute(self):
+        return self.fast(self.viewer, meta_type=self.meta_type, **self.kwargs)
 
 
 class GetDisplayName:
+    pure = True
 
     def __init__(self, viewer, target, rich=False, plain=False, **kwargs):
         self.viewer = viewer
@@ -77,36 +105,45 @@ class GetDisplayName:
         self.rich = rich
         self.plain = plain
 
-    def execute(self):
-        if (name := WORLD.try_component(self.target, COMPONENTS["Name"])):
-            if self.rich:
+    @classmethod
+    def fast(cls, viewer, target, rich=False, plain=False, **kwargs):
+        if (name := WORLD.try_component(target, COMPONENTS["Name"])):
+            if rich:
                 return name.rich
-            if self.plain:
+            if plain:
                 return name.plain
             return name.color
-        elif (comp := WORLD.try_component(self.target, COMPONENTS["EntityID"])):
+        elif (comp := WORLD.try_component(target, COMPONENTS["EntityID"])):
             fmt = f"{comp.module_name}/{comp.ent_id}"
         else:
-            fmt = f"Entity {self.target}"
-        if self.rich:
+            fmt = f"Entity {target}"
+        if rich:
             return Text(fmt)
         return fmt
 
+    def execute(self):
+        return self.fast(self.viewer, self.target, rich=self.rich, plain=self.plain, **self.kwargs)
+
 
 class GetContents:
     """
     Retrieve every Entity in an Entity's Inventory.
     """
+    pure = True
 
     def __init__(self, entity, **kwargs):
         self.entity = entity
         self.kwargs = kwargs
 
-    def execute(self) -> list[Entity]:
-        if (inv := WORLD.try_component(self.entity, COMPONENTS["Inventory"])):
+    @classmethod
+    def fast(cls, entity, **kwargs) -> list[Entity]:
+        if (inv := WORLD.try_component(entity, COMPONENTS["Inventory"])):
             return [i for i in inv.inventory if WORLD.entity_exists(i)]
         return []
 
+    def execute(self) -> list[Entity]:
+        return self.fast(self.entity, **self.kwargs)
+
 
 class VisibleEntities:
     """
@@ -118,14 +155,22 @@ class VisibleEntities:
         self.entities = entities
         self.kwargs = kwargs
 
+    @classmethod
+    def fast(cls, viewer, entities, **kwargs) -> list[Entity]:
+        return GETTER_BATCH["VisibleTo"](viewer, entities, **kwargs)
+
     def execute(self) -> list[Entity]:
-        g = GETTERS["VisibleTo"]
-        return [x for x in self.entities if g(self.viewer, x, **self.kwargs).execute()]
+        return self.fast(self.viewer, self.entities, **self.kwargs)
 
 
 class VisibleTo:
     """
     Check to see if viewer can see entity.
+
+    viewer_context() gathers everything about the viewer a check needs (detection flags,
+    light level, etc.) and check() tests one entity against it. batch() builds the context
+    once for any number of entities. Overrides should usually replace viewer_context() and
+    check(); replacing batch() alone, or the scalar fast()/execute() alone, also works.
     """
 
     def __init__(self, viewer, entity, **kwargs):
@@ -133,9 +178,27 @@ class VisibleTo:
         self.entity = entity
         self.kwargs = kwargs
 
-    def execute(self) -> bool:
+    @classmethod
+    def viewer_context(cls, viewer, **kwargs) -> dict:
+        return {"viewer": viewer}
+
+    @classmethod
+    def check(cls, context: dict, entity, **kwargs) -> bool:
         return True
 
+    @classmethod
+    def batch(cls, viewer, entities, **kwargs) -> list[Entity]:
+        context = cls.viewer_context(viewer, **kwargs)
+        check = cls.check
+        return [x for x in entities if check(context, x, **kwargs)]
+
+    @classmethod
+    def fast(cls, viewer, entity, **kwargs) -> bool:
+        return bool(cls.batch(viewer, (entity,), **kwargs))
+
+    def execute(self) -> bool:
+        return self.fast(self.viewer, self.entity, **self.kwargs)
+
 
 class VisibleContents:
     """
@@ -147,10 +210,13 @@ class VisibleContents:
         self.entity = entity
         self.kwargs = kwargs
 
+    @classmethod
+    def fast(cls, viewer, entity, **kwargs) -> list[Entity]:
+        contents = GETTER_FUNCS["GetContents"](entity, **kwargs)
+        return GETTER_FUNCS["VisibleEntities"](viewer, contents, **kwargs)
+
     def execute(self) -> list[Entity]:
-        vis_to = GETTERS["VisibleEntities"]
-        contents = GETTERS["GetContents"](self.entity, **self.kwargs).execute()
-        return vis_to(self.viewer, contents, **self.kwargs).execute()
+        return self.fast(self.viewer, self.entity, **self.kwargs)
 
 
 class EntityFromKeyAndGridCoordinates:
@@ -162,7 +228,7 @@ class EntityFromKeyAndGridCoordinates:
         self.coordinates = coordinates
 
     def execute(self):
-        if not (e := GETTERS["EntityFromKey"](self.module_name, self.entity_key).execute()):
+        if not (e := GETTER_FUNCS["EntityFromKey"](self.module_name, self.entity_key)):
             return None
         if not (grid := WORLD.try_component(e, COMPONENTS[self.comp])):
             return None
@@ -176,56 +242,157 @@ class EntityFromKeyAndGridCoordinates:
 
 
 class EntityFromKey:
+    pure = True
 
     def __init__(self, module_name: str, entity_key: str):
         self.module_name = module_name
         self.entity_key = entity_key
 
-    def execute(self):
-        if not (m := MODULES.get(self.module_name, None)):
+    @classmethod
+    def fast(cls, module_name: str, entity_key: str):
+        if not (m := MODULES.get(module_name, None)):
             return None
-        return m.entities.get(self.entity_key, None)
+        return m.entities.get(entity_key, None)
+
+    def execute(self):
+        return self.fast(self.module_name, self.entity_key)
+
+
+class GetMetaTypes:
+    pure = True
+
+    def __init__(self, ent, **kwargs):
+        self.ent = ent
+        self.kwargs = kwargs
+
+    @classmethod
+    def fast(cls, ent, **kwargs):
+        return WORLD.try_component(ent, COMPONENTS["MetaTypes"])
+
+    def execute(self):
+        return self.fast(self.ent, **self.kwargs)
 
 
 class GetRoomLocation:
+    pure = True
 
     def __init__(self, ent):
         self.ent = ent
 
-    def execute(self):
-        if (in_room := WORLD.try_component(self.ent, COMPONENTS["InRoom"])):
+    @classmethod
+    def fast(cls, ent):
+        if (in_room := WORLD.try_component(ent, COMPONENTS["InRoom"])):
             return in_room.holder
         return None
 
+    def execute(self):
+        return self.fast(self.ent)
+
 
 class Gender:
+    pure = True
+    viewer_dependent = False
 
     def __init__(self, viewer, target, **kwargs):
         self.viewer = viewer
         self.target = target
         self.kwargs = kwargs
 
-    def execute(self):
+    @classmethod
+    def fast(cls, viewer, target, **kwargs):
         return "neuter"
 
+    def execute(self):
+        return self.fast(self.viewer, self.target, **self.kwargs)
+
 
 class GetAllContainedEntities:
+    """
+    Return every Entity held by ent, directly or nested, in post-order: anything an Entity
+    holds comes before that Entity. ent itself is not included. Entities are visited at most
+    once, so containment cycles can't cause infinite loops.
+    """
 
-    def __init__(self, ent):
+    def __init__(self, ent, **kwargs):
         self.ent = ent
+        self.kwargs = kwargs
 
-    def execute(self):
-        if (eq := WORLD.try_component(self.ent, COMPONENTS["Equipment"])):
-            for k, v in eq.equipment.items():
-                if not WORLD.entity_exists(v.item):
-                    continue
-                for x in GETTERS["GetAllContainedEntities"](v.item).execute():
-                    yield x
-                yield v.item
-        if (inv := WORLD.try_component(self.ent, COMPONENTS["Inventory"])):
-            for i in inv.inventory:
-                if not WORLD.entity_exists(i):
+    @classmethod
+    def children(cls, ent) -> list[Entity]:
+        out = list()
+        if (eq := WORLD.try_component(ent, COMPONENTS["Equipment"])):
+            out.extend(v.item for v in eq.equipment.values())
+        if (inv := WORLD.try_component(ent, COMPONENTS["Inventory"])):
+            out.extend(inv.inventory)
+        return out
+
+    @classmethod
+    def fast(cls, ent, **kwargs) -> list[Entity]:
+        exists = WORLD.entity_exists
+        seen = {ent}
+        out = list()
+        stack = [(ent, False)]
+        while stack:
+            e, expanded = stack.pop()
+            if expanded:
+                out.append(e)
+                continue
+            stack.append((e, True))
+            for c in reversed(cls.children(e)):
+                if c in seen or not exists(c):
                     continue
-                for x in GETTERS["GetAllContainedEntities"](i).execute():
-                    yield x
-                yield i
\ No newline at end of file
+                seen.add(c)
+                stack.append((c, False))
+        out.pop()
+        return out
+
+    def execute(self) -> list[Entity]:
+        return self.fast(self.ent, **self.kwargs)
+
+
+class GetStatModifiers:
+    """
+    Sum stat_bonus and stat_multiplier over every Modifier on an entity and on anything it
+    has equipped. This is uncached; use GetStat, which caches the totals.
+    """
+
+    def __init__(self, ent, stat_name: str, **kwargs):
+        self.ent = ent
+        self.stat_name = stat_name
+        self.kwargs = kwargs
+
+    def modifiers(self):
+        sources = [self.ent]
+        if (eq := WORLD.try_component(self.ent, COMPONENTS["Equipment"])):
+            sources.extend(i for i in eq.all() if WORLD.entity_exists(i))
+        for source in sources:
+            for comp in WORLD.components_for_entity(source):
+                if isinstance(comp, _ModBase):
+                    yield from comp.all()
+
+    def execute(self) -> tuple[int, float]:
+        bonus, mult = 0, 0.0
+        for m in self.modifiers():
+            bonus += m.stat_bonus(self.ent, self.stat_name)
+            mult += m.stat_multiplier(self.ent, self.stat_name)
+        return bonus, mult
+
+
+class GetStat:
+    """
+    A stat's final value for an entity, from base and every Modifier affecting it. The totals
+    are cached by snekmud.stats, so this is cheap to call from combat formulas.
+    """
+
+    def __init__(self, ent, stat_name: str, base=0, **kwargs):
+        self.ent = ent
+        self.stat_name = stat_name
+        self.base = base
+        self.kwargs = kwargs
+
+    @classmethod
+    def fast(cls, ent, stat_name: str, base=0, **kwargs):
+        return get_stat(ent, stat_name, base)
+
+    def execute(self):
+        return self.fast(self.ent, self.stat_name, self.base, **self.kwargs)
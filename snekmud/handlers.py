@@ -4,6 +4,7 @@ import time
 from snekmud.serialize import serialize_entity, deserialize_entity
 import logging
 from snekmud.utils import get_or_emplace
+from snekmud.db.roster import characters_for
 
 class AccountHandler:
 
@@ -12,10 +13,10 @@ class AccountHandler:
         self.connections = dict()
 
     def player_ids(self):
-        return self.owner.characters.all().values_list("id", flat=True)
+        return [c.id for c in characters_for(self.owner.id)]
 
     def characters_brief(self):
-        return self.owner.characters.all().values_list("id", "name")
+        return [(c.id, c.name) for c in characters_for(self.owner.id)]
 
     def send(self, **kwargs):
         for c in self.connections.values():
@@ -28,6 +29,7 @@ class AccountHandler:
 
 
 class GameSessionHandler:
+    save_fields = ["data", "inventory", "equipment"]
 
     def __init__(self, owner):
         self.owner = owner
@@ -38,14 +40,17 @@ class GameSessionHandler:
         self.cmdhandler = None
         self.cmdhandler_name = None
         self.time_last_activity = time.monotonic()
+        self.time_last_saved = time.monotonic()
 
     def copyover_export(self) -> dict:
         out = {"time_last_activity": self.time_last_activity,
+               "time_last_saved": self.time_last_saved,
                "cmdhandler": self.cmdhandler_name}
         return out
 
     async def copyover_recover(self, data):
         self.time_last_activity = data.pop("time_last_activity")
+        self.time_last_saved = data.pop("time_last_saved", self.time_last_saved)
         await self.at_start(copyover=True, cmdhandler=data.pop("cmdhandler"))
 
     def send(self, **kwargs):
@@ -104,6 +109,7 @@ class GameSessionHandler:
         c = self.character
 
         cmd = get_or_emplace(c, snekmud.COMPONENTS["HasCmdHandler"])
+        get_or_emplace(c, snekmud.COMPONENTS["Receiver"])
         snekmud.WORLD.add_component(c, snekmud.COMPONENTS["HasSession"](session=self.owner))
         await cmd.set_cmdhandler("Play")
 
@@ -150,7 +156,11 @@ class GameSessionHandler:
         if self.is_possessing():
             await self.unposess()
 
-    async def save_character(self):
+    def serialize_character(self):
+        """
+        Copy the character's current state onto its PlayerCharacter without saving it.
+        Fields written are listed in save_fields.
+        """
         data = serialize_entity(self.character)
         inventory = data.pop("Inventory", None)
         equipment = data.pop("Equipment", None)
@@ -158,10 +168,19 @@ class GameSessionHandler:
         pc.data = data
         pc.inventory = inventory
         pc.equipment = equipment
-        pc.save(update_fields=["data", "inventory", "equipment"])
+        return pc
+
+    async def save_character(self):
+        pc = self.serialize_character()
+        pc.save(update_fields=self.save_fields)
+        self.time_last_saved = time.monotonic()
 
     async def extract_character(self):
-        await snekmud.OPERATIONS["ExtractEntity"].execute(self.character)
+        # let go of it first, so an autosave sweep during the awaits below or in
+        # terminate_play() can't serialize a half-deleted character.
+        character, self.character, self.puppet = self.character, None, None
+        if character is not None:
+            await snekmud.OPERATIONS["ExtractEntity"](character).execute()
 
     async def update_stats(self):
         pass
@@ -12,16 +12,22 @@ def setup_django():
     from django.conf import settings
     from server.conf import django_settings
     settings.configure(default_settings=django_settings)
+    from snekmud.db import tuning
+    tuning.install(settings)
     django.setup()
+    from snekmud.db import roster
+    roster.install()
 
 
 def load_modifiers():
+    from snekmud.modifiers import build_modifier_index, register_modifier
     mod_paths = mudforge.CONFIG.MODIFIERS
 
     for mod_path in mod_paths:
         for k, v in callables_from_module(mod_path).items():
-            snekmud.MODIFIERS_NAMES[v.category][v.get_name()] = v
-            snekmud.MODIFIERS_ID[v.category][v.modifier_id] = v
+            register_modifier(v)
+
+    build_modifier_index()
 
 
 def load_components():
@@ -73,11 +79,37 @@ def load_meta():
 def load_getters():
     for path in mudforge.CONFIG.GETTER_PATHS:
         snekmud.GETTERS.update(callables_from_module(path))
+    build_getter_funcs()
+
+
+def build_getter_funcs():
+    """
+    Rebuild snekmud.GETTER_FUNCS and snekmud.GETTER_BATCH from snekmud.GETTERS. Call this
+    again if GETTERS is altered after load.
+    """
+    from snekmud.utils import fast_callable, batch_callable
+    from snekmud.memo import memoized
+    snekmud.GETTER_FUNCS.clear()
+    for k, v in snekmud.GETTERS.items():
+        if not hasattr(v, "execute"):
+            continue
+        func = fast_callable(v)
+        snekmud.GETTER_FUNCS[k] = memoized(k, func) if getattr(v, "pure", False) else func
+    snekmud.GETTER_BATCH.clear()
+    snekmud.GETTER_BATCH.update({k: batch_callable(v) for k, v in snekmud.GETTERS.items() if hasattr(v, "batch")})
 
 
 def clean_gamesessions():
     from snekmud.db.gamesessions.models import GameSession
+    from snekmud.sessions import clear_gamesessions
     GameSession.objects.all().delete()
+    clear_gamesessions()
+
+
+def warm_caches():
+    from snekmud.verb_conjugation import conjugate, pronouns
+    conjugate.warm_cache()
+    pronouns.warm_cache()
 
 
 def early_launch():
@@ -90,6 +122,7 @@ def early_launch():
     load_operations()
     load_getters()
     load_meta()
+    warm_caches()
 
     snekmud.PY_DICT["snekmud"] = snekmud
     snekmud.PY_DICT["mudforge"] = mudforge
@@ -100,18 +133,26 @@ def cold_start():
 
 
 def copyover(data_dict):
-    from snekmud.db.gamesessions.models import GameSession
+    from snekmud.sessions import all_gamesessions
+
+    # the old process mustn't keep saving once the sessions are handed over.
+    mudforge.GAME.stop_autosave()
+
+    for m in snekmud.MODULES.values():
+        m.id_allocator.save(exact=True)
 
     sessions = dict()
 
-    for x in GameSession.objects.all():
-        sessions[x.id.id] = x.handler.copyover_export()
+    for x in all_gamesessions():
+        sessions[x.pk] = x.handler.copyover_export()
     data_dict["sessions"] = sessions
 
 
 async def copyover_recover_stage_2(data_dict):
-    from snekmud.db.gamesessions.models import GameSession
+    from snekmud.sessions import gamesession_for, load_gamesessions
 
-    for k, v in data_dict.pop("sessions", dict()).items():
-        if (sess := GameSession.objects.filter(id=k).first()):
+    sessions = {int(k): v for k, v in data_dict.pop("sessions", dict()).items()}
+    load_gamesessions([k for k in sessions if not gamesession_for(k)])
+    for k, v in sessions.items():
+        if (sess := gamesession_for(k)):
             await sess.handler.copyover_recover(v)
\ No newline at end of file
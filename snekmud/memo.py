@@ -0,0 +1,81 @@
+"""
+Short-lived memoization for pure Getters.
+
+A Getter class with `pure = True` promises that its result depends only on its arguments
+and the current state of the World. Inside a memo_scope(), calls through GETTER_FUNCS to
+such Getters are cached by arguments; outside of one they run normally. Scopes are tracked
+per asyncio task through a ContextVar, and are meant to span one command, message or tick.
+SnekWorld calls invalidate_memo() whenever a component is added or removed or an entity is
+deleted, and Operations which mutate components in place call it themselves.
+
+Tasks started inside a scope inherit it, but it stops caching for them once it closes.
+"""
+import typing
+from contextlib import contextmanager
+from contextvars import ContextVar
+from rich.text import Text
+
+
+
+class _Scope(dict):
+    __slots__ = ("closed",)
+
+    def __init__(self):
+        super().__init__()
+        self.closed = False
+
+
+_SCOPE: ContextVar[typing.Optional[_Scope]] = ContextVar("snekmud_memo", default=None)
+
+# Results of these types are copied on the way out so callers can't corrupt the cache.
+_COPY_TYPES = (list, dict, set, Text)
+
+
+@contextmanager
+def memo_scope():
+    """
+    Open a memoization scope. Nested scopes share the outermost one's cache.
+    """
+    if (scope := _SCOPE.get()) is not None and not scope.closed:
+        yield
+        return
+    scope = _Scope()
+    token = _SCOPE.set(scope)
+    try:
+        yield
+    finally:
+        scope.closed = True
+        scope.clear()
+        _SCOPE.reset(token)
+
+
+def invalidate_memo():
+    """
+    Forget everything cached in the current scope, if any.
+    """
+    if (scope := _SCOPE.get()) is not None:
+        scope.clear()
+
+
+def memoized(name: str, func: typing.Callable) -> typing.Callable:
+    """
+    Wrap a resolved Getter callable so that it caches within a memo_scope().
+    """
+    def call(*args, **kwargs):
+        if (scope := _SCOPE.get()) is None or scope.closed:
+            return func(*args, **kwargs)
+        key = (name, args, tuple(kwargs.items())) if kwargs else (name, args)
+        try:
+            result = scope[key]
+        except KeyError:
+            result = scope[key] = func(*args, **kwargs)
+        except TypeError:
+            # unhashable arguments can't be cached.
+            return func(*args, **kwargs)
+        if isinstance(result, _COPY_TYPES):
+            return result.copy()
+        return result
+
+    call.__name__ = getattr(func, "__name__", name)
+    call.__wrapped__ = func
+    return call
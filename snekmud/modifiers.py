@@ -1,9 +1,12 @@
 import typing
-from snekmud import MODIFIERS_ID, MODIFIERS_NAMES
-from mudforge.utils import partial_match, lazy_property
+from snekmud import MODIFIERS_ID, MODIFIERS_NAMES, MODIFIERS_HOLDERS, MODIFIERS_PREFIX
+from snekmud.typing import Entity
+from mudforge.utils import lazy_property
 from snekmud.exceptions import DatabaseError
 from snekmud import OPERATIONS, WORLD, COMPONENTS
 from snekmud.utils import get_or_emplace
+from snekmud.stats import invalidate_stats
+from snekmud.serialize import mark_dirty
 
 
 class Modifier:
@@ -34,6 +37,87 @@ class Modifier:
         return 0
 
 
+# how many names each category had when its prefix index was built.
+_INDEXED_COUNTS: dict[str, int] = dict()
+
+
+def register_modifier(modifier: typing.Type["Modifier"]):
+    """
+    Add a Modifier class to MODIFIERS_NAMES and MODIFIERS_ID. Its category's prefix index is
+    rebuilt on the next lookup.
+    """
+    MODIFIERS_NAMES[modifier.category][modifier.get_name()] = modifier
+    MODIFIERS_ID[modifier.category][modifier.modifier_id] = modifier
+    MODIFIERS_PREFIX.pop(modifier.category, None)
+
+
+def build_modifier_index(category: typing.Optional[str] = None):
+    """
+    Build the case-folded prefix index used for partial flag names.
+
+    Every prefix of every name maps to exactly one Modifier. When names share a prefix, the
+    shortest name wins and ties are broken alphabetically, so an exact match (ignoring case)
+    always beats a longer name that starts with it.
+
+    find_modifier() builds a category's index on first use, and rebuilds it if names were
+    added to MODIFIERS_NAMES since.
+
+    Args:
+        category (str, optional): Only rebuild this category. Rebuilds all if not given.
+    """
+    categories = [category] if category else list(MODIFIERS_NAMES.keys())
+    for cat in categories:
+        names = MODIFIERS_NAMES[cat]
+        index = MODIFIERS_PREFIX[cat] = dict()
+        _INDEXED_COUNTS[cat] = len(names)
+        for name in sorted(names.keys(), key=lambda n: (len(n), n.casefold(), n)):
+            folded = name.casefold()
+            for i in range(1, len(folded) + 1):
+                index.setdefault(folded[:i], names[name])
+
+
+def find_modifier(category: str, flag: typing.Union[int, str, typing.Type["Modifier"]]) -> typing.Optional[typing.Type["Modifier"]]:
+    """
+    Resolve a flag to its Modifier class within a category.
+
+    Args:
+        category (str): The modifier category, such as RoomFlags.
+        flag (int, str or Modifier class): ID, name, or partial name of the flag.
+
+    Returns:
+        The Modifier class, or None if nothing matched.
+    """
+    if isinstance(flag, type):
+        return flag if issubclass(flag, Modifier) else None
+    if isinstance(flag, int):
+        return MODIFIERS_ID[category].get(flag, None)
+    if isinstance(flag, str):
+        names = MODIFIERS_NAMES[category]
+        if (found := names.get(flag, None)):
+            return found
+        if category not in MODIFIERS_PREFIX or _INDEXED_COUNTS.get(category, None) != len(names):
+            build_modifier_index(category)
+        return MODIFIERS_PREFIX[category].get(flag.casefold(), None)
+    return None
+
+
+def find_modifiers(category: str, flags) -> tuple[list[typing.Type["Modifier"]], list]:
+    """
+    Resolve many flags at once, such as the arguments of an OLC flag toggle.
+
+    Returns:
+        found, missing (tuple): The resolved Modifier classes in input order without
+            duplicates, and the flags that did not resolve.
+    """
+    found, missing = dict(), list()
+    for flag in flags:
+        if (m := find_modifier(category, flag)):
+            found[m] = True
+        else:
+            missing.append(flag)
+    return list(found.keys()), missing
+
+
 class _ModHandler:
     comp_name = None
 
@@ -44,16 +128,39 @@ class _ModHandler:
     def comp(self):
         return get_or_emplace(self.ent, COMPONENTS[self.comp_name])
 
+    def existing(self):
+        """
+        The component if the entity has one. Unlike comp, this never adds it.
+        """
+        return WORLD.try_component(self.ent, COMPONENTS[self.comp_name])
+
+    @classmethod
+    def category(cls) -> str:
+        return COMPONENTS[cls.comp_name].category()
+
     def find(self, flag):
-        if (found := self.comp.find(flag)):
-            return found
-        elif isinstance(flag, str):
-            if (fname := partial_match(flag, MODIFIERS_NAMES[self.comp.category()].keys())):
-                return MODIFIERS_NAMES[self.comp.category()][fname]
-        return None
+        return find_modifier(self.category(), flag)
+
+    def find_many(self, flags, strict: bool = False) -> list[typing.Type["Modifier"]]:
+        """
+        Resolve several flags in one call.
+
+        Args:
+            flags (iterable): IDs, names or partial names.
+            strict (bool): raise error if any flag doesn't exist.
+
+        Raises:
+            DatabaseError if strict and any flag does not exist.
+        """
+        found, missing = find_modifiers(self.category(), flags)
+        if missing and strict:
+            raise DatabaseError(f"{self.category()} not found: {', '.join(str(m) for m in missing)}")
+        return found
 
     def all(self):
-        return self.comp.all()
+        if (comp := self.existing()):
+            return comp.all()
+        return []
 
     def ids(self):
         return [x.modifier_id for x in self.all()]
@@ -80,7 +187,9 @@ class SingleModifier(_ModHandler):
                 comp.modifier = self.default(ent)
 
     def get(self) -> typing.Optional["Modifier"]:
-        return self.comp.modifier
+        if (comp := self.existing()):
+            return comp.modifier
+        return None
 
     def set(self, flag: typing.Union[int, str, typing.Type["Modifier"]], strict: bool = False):
         """
@@ -95,11 +204,15 @@ class SingleModifier(_ModHandler):
         """
         if (found := self.find(flag)):
             self.comp.modifier = found(self.ent)
+            invalidate_stats(self.ent)
+            mark_dirty(self.ent)
         elif strict:
             raise DatabaseError(f"{self.comp.category()} {flag} not found!")
 
     def clear(self):
         self.comp.modifier = None
+        invalidate_stats(self.ent)
+        mark_dirty(self.ent)
 
 
 class MultiModifier(_ModHandler):
@@ -121,10 +234,69 @@ class MultiModifier(_ModHandler):
         Returns:
             answer (bool): Whether owner has flag.
         """
-        if (found := self.find(flag)):
-            return found.modifier_id in self.ids()
+        if (comp := self.existing()) and (found := self.find(flag)):
+            return found.modifier_id in comp.ids
         return False
 
+    def has_all(self, *flags) -> bool:
+        """
+        Returns whether owner has every one of the given flags. Unknown flags count as missing.
+        """
+        ids = comp.ids if (comp := self.existing()) else ()
+        for flag in flags:
+            if not (found := self.find(flag)) or found.modifier_id not in ids:
+                return False
+        return True
+
+    def has_any(self, *flags) -> bool:
+        """
+        Returns whether owner has at least one of the given flags.
+        """
+        if not (comp := self.existing()):
+            return False
+        ids = comp.ids
+        return any((found := self.find(flag)) and found.modifier_id in ids for flag in flags)
+
+    @classmethod
+    def query(cls, all_of=(), any_of=(), none_of=()) -> set[Entity]:
+        """
+        Find every entity holding a combination of flags in this category, using the
+        holder index instead of scanning entities.
+
+        Args:
+            all_of (iterable): Flags that must all be present.
+            any_of (iterable): At least one of these flags must be present.
+            none_of (iterable): None of these flags may be present.
+
+        Returns:
+            matches (set): The matching entities.
+
+        Examples:
+            RoomFlags.query(all_of=["DARK"], none_of=["NO_MOB"])
+        """
+        category = cls.category()
+        holders = MODIFIERS_HOLDERS[category]
+
+        def resolve(flags):
+            return [found.modifier_id if (found := find_modifier(category, f)) else None for f in flags]
+
+        result = None
+        if all_of:
+            ids = resolve(all_of)
+            if None in ids:
+                return set()
+            sets = sorted((holders.get(i, set()) for i in ids), key=len)
+            result = sets[0].intersection(*sets[1:])
+        if any_of:
+            union = set().union(*(holders.get(i, set()) for i in resolve(any_of) if i is not None))
+            result = union if result is None else result & union
+        if result is None:
+            result = set(WORLD.view(COMPONENTS[cls.comp_name]))
+        for i in resolve(none_of):
+            if i is not None and (excluded := holders.get(i, None)):
+                result = result - excluded
+        return {ent for ent in result if WORLD.entity_exists(ent)}
+
     def add(self, flag: typing.Union[int, str, typing.Type["Modifier"]], strict=False):
         """
         Used to add a flag to owner.
@@ -137,11 +309,30 @@ class MultiModifier(_ModHandler):
             DatabaseError if flag does not exist.
         """
         if (found := self.find(flag)):
-            m = found(self.ent)
-            self.comp.modifiers[str(m)] = m
+            self.comp.add_modifier(found(self.ent))
+            invalidate_stats(self.ent)
+            mark_dirty(self.ent)
         elif strict:
             raise DatabaseError(f"{self.comp.category()} {flag} not found!")
 
+    def add_many(self, flags, strict=False):
+        """
+        Add several flags at once. With strict, nothing is added if any flag is unknown.
+        """
+        for found in self.find_many(flags, strict=strict):
+            self.comp.add_modifier(found(self.ent))
+        invalidate_stats(self.ent)
+        mark_dirty(self.ent)
+
+    def remove_many(self, flags, strict=False):
+        """
+        Remove several flags at once. With strict, nothing is removed if any flag is unknown.
+        """
+        for found in self.find_many(flags, strict=strict):
+            self.comp.remove_modifier(found.get_name())
+        invalidate_stats(self.ent)
+        mark_dirty(self.ent)
+
     def remove(self, flag: typing.Union[int, str], strict=False):
         """
         Removes a flag if owner has it.
@@ -154,6 +345,8 @@ class MultiModifier(_ModHandler):
             DatabaseError if flag does not exist.
         """
         if (found := self.find(flag)):
-            self.comp.modifiers.pop(found.get_name(), None)
+            self.comp.remove_modifier(found.get_name())
+            invalidate_stats(self.ent)
+            mark_dirty(self.ent)
         elif strict:
             raise DatabaseError(f"{self.comp.category()} {flag} not found!")
\ No newline at end of file
@@ -1,11 +1,12 @@
 import sys
+import typing
+from collections import defaultdict
 from pathlib import Path
 from snekmud.db.players.models import PlayerCharacter
 from snekmud.typing import Entity
-from mudforge.utils import generate_name
 from snekmud import components as cm
-from snekmud.utils import read_json_file
-from snekmud.serialize import deserialize_entity
+from snekmud.utils import read_json_file, write_json_file
+from snekmud.serialize import deserialize_entity, build_template, spawn_entities
 from snekmud import WORLD, PLAYER_ID
 import logging
 
@@ -18,12 +19,197 @@ class Prototype:
         self.entities = dict()
         self.path = path
         self.cached = None
+        self.template = None
 
-    def get(self):
+    def get(self) -> dict:
+        """
+        Returns the prototype's data. The top-level dict is a copy, but nested values are
+        shared with the cache and must not be mutated.
+        """
         if self.cached is None:
-            self.cached = read_json_file(self.path)
+            self.cached = read_json_file(self.path) or dict()
             self.cached["Prototype"] = {"module_name": self.module.name, "prototype": self.name}
-        return self.cached
+        return dict(self.cached)
+
+    def get_template(self) -> list:
+        if self.template is None:
+            self.template = build_template(self.get())
+        return self.template
+
+    def spawn(self, count: int = 1, overrides: typing.Optional[dict] = None) -> list[Entity]:
+        """
+        Create entities from this prototype in one call, such as for a zone reset.
+
+        The prototype is decoded into a component template once and reused for every
+        entity. IDs are reserved as a single range and all entities are indexed in the
+        Module at the end.
+
+        Args:
+            count (int): How many entities to create.
+            overrides (dict, optional): Serialized component data, keyed by component
+                name, replacing the prototype's data for those components.
+
+        Returns:
+            entities (list): The new entities.
+        """
+        template = self.get_template()
+        if overrides:
+            replaced = {entry.comp_class: entry for entry in build_template(overrides)}
+            template = [replaced.pop(entry.comp_class, entry) for entry in template] + list(replaced.values())
+
+        ids = self.module.id_allocator.reserve_ids(self.name, count)
+        mod_name = self.module.name
+
+        def entity_id(i):
+            return [cm.EntityID(module_name=mod_name, prototype=self.name, ent_id=ids[i])]
+
+        entities = spawn_entities(template, count, extra=entity_id)
+        spawned = dict(zip(ids, entities))
+        self.entities.update(spawned)
+        self.module.entities.update(spawned)
+        return entities
+
+
+class IDAllocator:
+    """
+    Hands out entity IDs per prototype from monotonic counters, without looking at the IDs
+    already in use.
+
+    IDs are "<prototype>_<n>", counting from 0. (IDs used to come from
+    mudforge.utils.generate_name; any in the old format are left alone.)
+
+    Counters are persisted as high-water marks in the module's save path. Numbers are
+    claimed from disk a block at a time, so a crash may skip some but can never hand out
+    one that was already issued. The same goes for an ordinary restart: the next process
+    starts from the last high-water mark, skipping up to block_size numbers per prototype.
+    Copyover writes the exact counters so nothing is skipped.
+
+    If the counter file is missing, the IDs stored in PlayerCharacter inventories and
+    equipment are scanned before anything is handed out. IDs of entities loaded from module
+    data are observed as they're indexed.
+    """
+    filename = "id_counters.json"
+    block_size = 1000
+
+    def __init__(self, module_name: str, save_path: Path):
+        self.module_name = module_name
+        self.path = save_path / self.filename
+        self.counters: dict[str, int] = dict()
+        self.limits: dict[str, int] = dict()
+        self.loaded = False
+
+    def load(self):
+        self.loaded = True
+        if not self.path.exists():
+            self.recover()
+        elif (data := read_json_file(self.path)):
+            for proto, high_water in data.items():
+                self.counters[proto] = max(self.counters.get(proto, 0), high_water)
+                self.limits[proto] = max(self.limits.get(proto, 0), high_water)
+
+    def recover(self):
+        """
+        Raise the counters past every ID of this module held in a stored character's
+        inventory or equipment.
+        """
+        for proto, n in stored_id_counters().get(self.module_name, dict()).items():
+            self.advance(proto, n)
+
+    def save(self, exact: bool = False):
+        """
+        Persist the counters. By default the reserved high-water marks are written; exact
+        writes the next unused number instead, for a clean handoff across copyover.
+        """
+        if not self.loaded:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_file(self.path, dict(self.counters if exact else self.limits))
+
+    def reserve(self, proto: str, count: int = 1) -> range:
+        """
+        Claim a contiguous range of numbers for a prototype. Used directly by bulk spawns.
+        """
+        if not self.loaded:
+            self.load()
+        start = self.counters.get(proto, 0)
+        end = start + count
+        self.counters[proto] = end
+        if end > self.limits.get(proto, 0):
+            self.limits[proto] = end + self.block_size
+            self.save()
+        return range(start, end)
+
+    def make_id(self, proto: str, number: int) -> str:
+        return f"{proto}_{number}"
+
+    def reserve_ids(self, proto: str, count: int = 1) -> list[str]:
+        return [self.make_id(proto, n) for n in self.reserve(proto, count)]
+
+    def observe(self, proto: str, ent_id: str):
+        """
+        Make sure an ID loaded from elsewhere is never handed out again.
+        """
+        if not self.loaded:
+            self.load()
+        if (number := id_number(proto, ent_id)) is not None:
+            self.advance(proto, number + 1)
+
+    def advance(self, proto: str, n: int):
+        """
+        Make sure proto's counter is at least n.
+        """
+        if n > self.counters.get(proto, 0):
+            self.counters[proto] = n
+            self.limits[proto] = max(self.limits.get(proto, 0), n)
+
+
+def id_number(proto: str, ent_id: str) -> typing.Optional[int]:
+    """
+    The number of an ID made by IDAllocator for proto, or None if it isn't one.
+    """
+    prefix, sep, number = ent_id.rpartition("_")
+    if sep and prefix == proto and number.isdigit():
+        return int(number)
+    return None
+
+
+def stored_entity_ids(data: typing.Any) -> typing.Iterator[tuple[str, str, str]]:
+    """
+    Find the EntityIDs in serialized entity data, however deeply nested.
+
+    Yields:
+        (module_name, prototype, ent_id) for each one.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            if isinstance(found := value.get("EntityID", None), dict):
+                yield found.get("module_name", ""), found.get("prototype", ""), found.get("ent_id", "")
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+
+
+# module name: {prototype: next unused number}, from stored characters. See stored_id_counters.
+_STORED_COUNTERS: typing.Optional[dict[str, dict[str, int]]] = None
+
+
+def stored_id_counters() -> dict[str, dict[str, int]]:
+    """
+    Scan every stored PlayerCharacter's inventory and equipment for entity IDs, once, and
+    return the next unused number for each module and prototype found.
+    """
+    global _STORED_COUNTERS
+    if _STORED_COUNTERS is None:
+        counters = defaultdict(dict)
+        for row in PlayerCharacter.objects.values_list("inventory", "equipment").iterator():
+            for module_name, proto, ent_id in stored_entity_ids(row):
+                if (number := id_number(proto, ent_id)) is not None:
+                    found = counters[module_name]
+                    found[proto] = max(found.get(proto, 0), number + 1)
+        _STORED_COUNTERS = dict(counters)
+    return _STORED_COUNTERS
 
 
 class Module:
@@ -39,6 +225,7 @@ class Module:
         self.save_path = save_path
         self.meta = meta
         self.sort_order = meta.pop("sort_order", 99999999999999)
+        self.id_allocator = IDAllocator(self.name, save_path)
 
     def __str__(self):
         return self.name
@@ -105,13 +292,14 @@ class Module:
             return
         self.prototypes[e_id.prototype].entities[e_id.ent_id] = ent
         self.entities[e_id.ent_id] = ent
+        self.id_allocator.observe(e_id.prototype, e_id.ent_id)
 
     async def load_entities_finalize(self):
         pass
 
     def assign_id(self, ent: Entity, proto: str, index: bool = True):
         p = self.prototypes[proto]
-        new_id = generate_name(proto, p.entities.keys())
+        new_id = self.id_allocator.reserve_ids(proto)[0]
         WORLD.add_component(ent, cm.EntityID(module_name=self.name, prototype=proto, ent_id=new_id))
         if index:
             self.entities[new_id] = ent
@@ -1,10 +1,12 @@
 from mudforge.utils import make_iter, is_iter
 from snekmud.typing import Entity
-from snekmud import COMPONENTS, WORLD, OPERATIONS, MODULES, GETTERS
+from snekmud import COMPONENTS, WORLD, OPERATIONS, MODULES, GETTER_FUNCS, LISTENERS
 from rich.text import Text
 from server.conf import settings
 from snekmud import funcparser
-from snekmud.utils import get_or_emplace
+from snekmud.sessions import session_for
+from snekmud.utils import LazyMessage
+from snekmud.memo import memo_scope
 
 
 # init the actor-stance funcparser for msg_contents
@@ -59,14 +61,41 @@ class DistributeMessage:
         if "you" not in mapping:
             mapping["you"] = you
 
-        print(f"MAPPING: {mapping}")
-
         recv_comp = COMPONENTS["Receiver"]
-        print(f"Distributing to: {self.recipients}")
-        for receiver in self.recipients:
-            # actor-stance replacements
+        with memo_scope():
+            template = funcparser.StanceTemplate.compile(inmessage, caller=you, mapping=mapping)
+            for receiver in self.recipients:
+                session = session_for(receiver)
+                # nobody is listening, so don't bother rendering.
+                if not session and receiver not in LISTENERS:
+                    continue
+
+                recv = WORLD.try_component(receiver, recv_comp)
+                if not session and recv is None:
+                    continue
+
+                if not session and recv.lazy_messages:
+                    outmessage = LazyMessage(self.render, inmessage, you, receiver, mapping, template)
+                else:
+                    outmessage = self.render(inmessage, you, receiver, mapping, template)
+
+                if recv is not None:
+                    recv.receive(outmessage, from_ent=you, msg_type=self.msg_type, **self.kwargs)
+                else:
+                    session.handler.send(line=outmessage)
+
+    def render(self, text: str, you: Entity, receiver: Entity, mapping: dict,
+               template: funcparser.StanceTemplate | None = None) -> str:
+        """
+        Render the message as receiver should see it. If given, template is text already
+        compiled by funcparser.StanceTemplate for this message.
+        """
+        # actor-stance replacements
+        if template is not None:
+            send_message = template.render(receiver)
+        else:
             send_message = _MSG_CONTENTS_PARSER.parse(
-                inmessage,
+                text,
                 raise_errors=True,
                 return_string=True,
                 caller=you,
@@ -74,19 +103,16 @@ class DistributeMessage:
                 mapping=mapping,
             )
 
-            # director-stance replacements
-            outmessage = send_message.format_map(
-                {
-                    key: GETTERS["GetDisplayName"](receiver, obj).execute()
-                    if WORLD.entity_exists(obj)
-                    else str(obj)
-                    for key, obj in mapping.items()
-                }
-            )
-            print(f"sending to {receiver}")
-            recv = get_or_emplace(receiver, recv_comp)
-            recv.receive(outmessage, from_ent=you, msg_type=self.msg_type, **self.kwargs)
-
+        # director-stance replacements
+        get_name = GETTER_FUNCS["GetDisplayName"]
+        return send_message.format_map(
+            {
+                key: get_name(receiver, obj)
+                if WORLD.entity_exists(obj)
+                else str(obj)
+                for key, obj in mapping.items()
+            }
+        )
 
 class MsgContents:
     """
@@ -106,7 +132,7 @@ class MsgContents:
         self.kwargs = kwargs
 
     async def execute(self):
-        contents = GETTERS["GetContents"](self.ent).execute()
+        contents = GETTER_FUNCS["GetContents"](self.ent)
         for x in self.exclude:
             if x in contents:
                 contents.remove(x)
@@ -127,5 +153,5 @@ class Say:
 
     async def execute(self):
         formatted = self.format_msg()
-        room = GETTERS["GetRoomLocation"](self.speaker).execute()
+        room = GETTER_FUNCS["GetRoomLocation"](self.speaker)
         await OPERATIONS["MsgContents"](room, text=formatted, msg_type="say", from_obj=self.speaker, **self.kwargs).execute()
\ No newline at end of file
@@ -4,6 +4,9 @@ from snekmud.equip import EquipSlot
 from snekmud.typing import Entity
 from snekmud import WORLD, COMPONENTS, OPERATIONS
 from snekmud.utils import get_or_emplace
+from snekmud.stats import invalidate_stats
+from snekmud.memo import invalidate_memo
+from snekmud.serialize import mark_dirty
 import typing
 from collections.abc import Iterable
 from mudforge.utils import make_iter
@@ -24,10 +27,12 @@ class AddToInventory:
         self.kwargs = kwargs
 
     async def execute(self):
+        invalidate_memo()
         c = get_or_emplace(self.dest, COMPONENTS[self.rev_comp])
         c.inventory.extend(self.ent)
         for e in self.ent:
             WORLD.add_component(e, COMPONENTS[self.comp](holder=self.dest))
+            mark_dirty(e)
             await self.at_receive_entity(e)
         await self.at_receive_entities()
 
@@ -49,6 +54,8 @@ class RemoveFromInventory:
 
     async def execute(self):
         if (i := WORLD.try_component(self.ent, COMPONENTS[self.rev_comp])):
+            invalidate_memo()
+            mark_dirty(self.ent)
             c = get_or_emplace(i.holder, COMPONENTS[self.comp])
             c.inventory.remove(self.ent)
             if not c.inventory:
@@ -75,6 +82,9 @@ class EquipToEntity:
         sl = self.slot(self.ent)
         e.equipment[self.slot.key] = sl
         WORLD.add_component(self.ent, COMPONENTS[self.rev_comp](holder=self.dest, slot=self.slot.key))
+        mark_dirty(self.ent)
+        invalidate_stats(self.dest)
+        invalidate_memo()
         await self.at_equip_entity(e, sl)
 
     async def at_equip_entity(self, eqp, slot_instance):
@@ -91,11 +101,14 @@ class UnequipFromEntity:
 
     async def execute(self):
         if (i := WORLD.try_component(self.ent, COMPONENTS[self.rev_comp])):
+            mark_dirty(self.ent)
             e = WORLD.component_for_entity(i.holder, COMPONENTS[self.comp])
             e.equipment.pop(i.slot, None)
             if not e.equipment:
                 WORLD.remove_component(i.holder, e.__class__)
             WORLD.remove_component(self.ent, i.__class__)
+            invalidate_stats(i.holder)
+            invalidate_memo()
 
 
 class AddToRoom(AddToInventory):
@@ -116,10 +129,12 @@ class DumpInventory:
         self.rev = COMPONENTS[self.rev_comp]
 
     async def execute(self) -> list[Entity]:
+        invalidate_memo()
+        mark_dirty(self.ent)
         i = get_or_emplace(self.ent, self.inv_comp)
         WORLD.remove_component(self.ent, self.inv_comp)
         for e in i.inventory:
-            WORLD.remove_component(e, self.rev_comp)
+            WORLD.remove_component(e, self.rev)
         return i.inventory
 
 
@@ -137,10 +152,13 @@ class DumpEquipment:
         self.rev = COMPONENTS[self.rev_comp]
 
     async def execute(self) -> list[Entity]:
+        mark_dirty(self.ent)
         i = get_or_emplace(self.ent, self.eq)
         for k, v in i.equipment.items():
-            WORLD.remove_component(v, self.rev)
-        WORLD.remove(self.ent, self.eq)
+            WORLD.remove_component(v.item, self.rev)
+        WORLD.remove_component(self.ent, self.eq)
+        invalidate_stats(self.ent)
+        invalidate_memo()
         return list(i.equipment.values())
 
 
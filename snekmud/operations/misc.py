@@ -1,4 +1,8 @@
-from snekmud import COMPONENTS, WORLD, OPERATIONS, MODULES, GETTERS
+from snekmud import COMPONENTS, WORLD, OPERATIONS, MODULES, GETTER_FUNCS
+from snekmud.utils import delete_entities
+from snekmud.stats import invalidate_stats
+from snekmud.memo import invalidate_memo
+from snekmud.serialize import mark_dirty
 
 
 class CleanupEntity:
@@ -11,13 +15,23 @@ class CleanupEntity:
 
 
 class ExtractEntity:
+    """
+    Remove an Entity and everything it contains from the game. Every Entity is cleaned up
+    first, then the whole set is deleted from the World in one pass.
+    """
+
     def __init__(self, ent):
         self.ent = ent
 
     async def execute(self):
+        invalidate_memo()
+        mark_dirty(self.ent)
+        targets = GETTER_FUNCS["GetAllContainedEntities"](self.ent)
+        targets.append(self.ent)
+
         cleanup = OPERATIONS["CleanupEntity"]
-        for x in GETTERS["GetAllContainedEntities"](self.ent).execute():
+        for x in targets:
             await cleanup(x).execute()
-            WORLD.delete_entity(x)
-        await cleanup(self.ent).execute()
-        WORLD.delete_entity(self.ent)
+            invalidate_stats(x)
+
+        delete_entities(targets)
@@ -1,3 +1,7 @@
+import copy
+import dataclasses
+import enum
+import typing
 from snekmud.typing import Entity
 from snekmud import WORLD, COMPONENTS, METATYPE_INTEGRITY
 import mudforge
@@ -15,6 +19,86 @@ def serialize_entity(ent: Entity) -> dict:
     return data
 
 
+# Serialized data for entities held by something else, with the subtree_stamp() it was made at.
+# WORLD drops an entity's entry when it is deleted or has a component added or removed.
+_SERIALIZED: dict[Entity, tuple[tuple, dict]] = WORLD.register_entity_cache(dict())
+
+_STABLE = (str, int, float, bool, type(None), enum.Enum)
+
+
+class _Unstable:
+    """
+    Stands in for a value the stamp can't see inside. It equals nothing, so whatever holds
+    it is always serialized again.
+    """
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return False
+
+    __hash__ = object.__hash__
+
+
+def freeze(value: typing.Any) -> typing.Any:
+    """
+    Copy value into something which compares equal to a later freeze() only if value's
+    contents are unchanged. Lists, tuples, dicts, sets and dataclasses are walked, so
+    in-place changes to them are seen.
+    """
+    if isinstance(value, _STABLE):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return type(value), tuple(freeze(getattr(value, f.name)) for f in dataclasses.fields(value))
+    return _Unstable()
+
+
+def _component_stamp(comp) -> typing.Any:
+    if (func := getattr(comp, "save_stamp", None)):
+        return func()
+    return freeze(comp)
+
+
+def subtree_stamp(ent: Entity) -> tuple:
+    """
+    A value which changes whenever ent's saved state may have: when a component is added,
+    removed or changed, when mark_dirty() is called on it, and when any of that happens to
+    an entity it contains.
+
+    Components stamp themselves with save_stamp() if they define it, and otherwise by
+    freeze()ing their fields.
+    """
+    return WORLD.entity_version(ent), tuple(_component_stamp(c) for c in WORLD.components_for_entity(ent))
+
+
+def serialize_entity_cached(ent: Entity) -> dict:
+    """
+    serialize_entity() for contained entities. The data is reused for as long as the entity's
+    subtree_stamp() doesn't change, and must not be modified.
+    """
+    stamp = subtree_stamp(ent)
+    if (cached := _SERIALIZED.get(ent, None)) is not None and cached[0] == stamp:
+        return cached[1]
+    data = serialize_entity(ent)
+    _SERIALIZED[ent] = (stamp, data)
+    return data
+
+
+def mark_dirty(ent: Entity):
+    """
+    Note that ent's saved state changed in a way subtree_stamp() can't see, such as a change
+    inside an object freeze() doesn't walk. It, and everything holding it, will be serialized
+    again on the next save.
+    """
+    if WORLD.entity_exists(ent):
+        WORLD.touch(ent)
+
+
 def integrity_check(ent: Entity):
     if (meta_comp := WORLD.try_component(ent, COMPONENTS["MetaTypes"])):
         for t in meta_comp.types:
@@ -22,21 +106,124 @@ def integrity_check(ent: Entity):
                 func(ent)
 
 
+def _finalize_entity(ent: Entity):
+    integrity_check(ent)
+
+    for comp in WORLD.components_for_entity(ent):
+        if (func := getattr(comp, "at_post_deserialize", None)):
+            func(ent)
+
+
 def deserialize_entity(data: dict, register=False) -> Entity:
+    """
+    Create an entity from serialized data. The data is not modified.
+    """
     ent = WORLD.create_entity()
 
     for k, v in COMPONENTS.items():
         if k not in data:
             continue
-        WORLD.add_component(ent, v.deserialize(data.pop(k), ent))
-
-    integrity_check(ent)
+        WORLD.add_component(ent, v.deserialize(data[k], ent))
 
-    for comp in WORLD.components_for_entity(ent):
-        if (func := getattr(comp, "at_post_deserialize", None)):
-            func(ent)
+    _finalize_entity(ent)
 
     if register and (comp := WORLD.try_component(ent, COMPONENTS['EntityID'])):
         mudforge.GAME.register_entity(ent, comp)
 
-    return ent
\ No newline at end of file
+    return ent
+
+
+def _is_immutable(value) -> bool:
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return True
+    if isinstance(value, tuple):
+        return all(_is_immutable(v) for v in value)
+    return False
+
+
+def mutable_fields(comp) -> tuple[str, ...]:
+    """
+    The dataclass fields of comp whose current values can't be shared between copies.
+    """
+    return tuple(f.name for f in dataclasses.fields(comp) if not _is_immutable(getattr(comp, f.name)))
+
+
+def clone_component(comp, deep: typing.Optional[typing.Iterable[str]] = None):
+    """
+    The default clone() for dataclass components: a shallow copy with the fields named in
+    deep (by default, every mutable one) deep-copied. Anything else in the instance's
+    __dict__, such as a lazy_property's cached value, is left out of the copy.
+    """
+    new = copy.copy(comp)
+    names = {f.name for f in dataclasses.fields(comp)}
+    for key in [key for key in new.__dict__ if key not in names]:
+        del new.__dict__[key]
+    for name in (mutable_fields(comp) if deep is None else deep):
+        setattr(new, name, copy.deepcopy(getattr(comp, name)))
+    return new
+
+
+class TemplateEntry:
+    """
+    One component of a template. Components which are `clonable` are decoded once into
+    prototype, which is cloned for each spawn; the rest keep their serialized data and are
+    deserialized per entity.
+    """
+    __slots__ = ("comp_class", "prototype", "deep", "data", "data_immutable")
+
+    def __init__(self, comp_class: typing.Type, data: typing.Any):
+        self.comp_class = comp_class
+        self.prototype = None
+        self.deep = ()
+        self.data = data
+        self.data_immutable = _is_immutable(data)
+        if getattr(comp_class, "clonable", False):
+            self.prototype = comp_class.deserialize(data, None)
+            if dataclasses.is_dataclass(self.prototype):
+                self.deep = mutable_fields(self.prototype)
+
+    def make(self, ent: Entity):
+        if self.prototype is not None:
+            return self.prototype.clone(self.deep)
+        return self.comp_class.deserialize(self.data if self.data_immutable else copy.deepcopy(self.data), ent)
+
+
+def build_template(data: dict) -> list[TemplateEntry]:
+    """
+    Decode serialized data once for repeated spawning.
+
+    Returns:
+        template (list): A TemplateEntry for each known component, in the order
+            deserialize_entity would add them. Unknown keys are dropped.
+    """
+    return [TemplateEntry(v, data[k]) for k, v in COMPONENTS.items() if k in data]
+
+
+def spawn_entities(template: list, count: int,
+                   extra: typing.Optional[typing.Callable[[int], typing.Iterable]] = None) -> list[Entity]:
+    """
+    Stamp out entities from a template made by build_template.
+
+    Clonable components are copied from their decoded prototype, sharing immutable field
+    values and deep-copying the rest, so no two entities (or the template) share state.
+
+    Args:
+        template (list): Output of build_template.
+        count (int): How many entities to create.
+        extra (callable, optional): Called with the spawn index, returns extra component
+            instances to add before integrity checks and post-deserialize hooks run.
+
+    Returns:
+        entities (list): The new entities, in spawn order.
+    """
+    out = list()
+    for i in range(count):
+        ent = WORLD.create_entity()
+        for entry in template:
+            WORLD.add_component(ent, entry.make(ent))
+        if extra:
+            for comp in extra(i):
+                WORLD.add_component(ent, comp)
+        _finalize_entity(ent)
+        out.append(ent)
+    return out
@@ -0,0 +1,93 @@
+"""
+Indexes of the entities that messages can be delivered to.
+
+HasSession keeps ENTITY_SESSIONS current as it is attached to and detached from entities, so
+message delivery can find an entity's session, or learn that it has none, with a single dict
+lookup. LISTENERS holds entities without a session that still want messages, such as NPCs
+with triggers; Receivers with `listener = True` register themselves.
+
+Live GameSessions are indexed here too, by character id in GAME_SESSIONS and by account id in
+ACCOUNT_SESSIONS. GameSession registers itself when saved and unregisters when deleted, so
+these are the primary index of who is playing; the database is only read back from during
+copyover recovery.
+"""
+import typing
+from snekmud import ENTITY_SESSIONS, LISTENERS, GAME_SESSIONS, ACCOUNT_SESSIONS
+from snekmud.typing import Entity
+
+
+def bind_session(ent: Entity, session):
+    ENTITY_SESSIONS[ent] = session
+
+
+def unbind_session(ent: Entity, session=None):
+    """
+    Drop ent from the index. If session is given, only do so if ent is still bound to it.
+    """
+    if session is None or ENTITY_SESSIONS.get(ent, None) is session:
+        ENTITY_SESSIONS.pop(ent, None)
+
+
+def session_for(ent: Entity) -> typing.Optional[typing.Any]:
+    return ENTITY_SESSIONS.get(ent, None)
+
+
+def has_session(ent: Entity) -> bool:
+    return ent in ENTITY_SESSIONS
+
+
+def add_listener(ent: Entity):
+    LISTENERS.add(ent)
+
+
+def remove_listener(ent: Entity):
+    LISTENERS.discard(ent)
+
+
+def wants_messages(ent: Entity) -> bool:
+    return ent in ENTITY_SESSIONS or ent in LISTENERS
+
+
+def register_gamesession(sess):
+    GAME_SESSIONS[sess.pk] = sess
+    ACCOUNT_SESSIONS[sess.account_id][sess.pk] = sess
+
+
+def unregister_gamesession(sess):
+    GAME_SESSIONS.pop(sess.pk, None)
+    if (by_account := ACCOUNT_SESSIONS.get(sess.account_id, None)) is not None:
+        by_account.pop(sess.pk, None)
+        if not by_account:
+            del ACCOUNT_SESSIONS[sess.account_id]
+
+
+def clear_gamesessions():
+    GAME_SESSIONS.clear()
+    ACCOUNT_SESSIONS.clear()
+
+
+def gamesession_for(character_id: int) -> typing.Optional[typing.Any]:
+    return GAME_SESSIONS.get(character_id, None)
+
+
+def gamesessions_for_account(account_id: int) -> list:
+    return list(ACCOUNT_SESSIONS.get(account_id, dict()).values())
+
+
+def all_gamesessions() -> list:
+    return list(GAME_SESSIONS.values())
+
+
+def load_gamesessions(character_ids: typing.Iterable[int]) -> dict:
+    """
+    Fetch the GameSessions for character_ids from the database in one query and register them.
+
+    Returns:
+        dict: character id: GameSession, for those found.
+    """
+    from snekmud.db.gamesessions.models import GameSession
+    found = dict()
+    for sess in GameSession.objects.filter(id__in=list(character_ids)).select_related("id", "account"):
+        register_gamesession(sess)
+        found[sess.pk] = sess
+    return found
@@ -19,6 +19,7 @@ CLASSES["default_module"] = "snekmud.modules.Module"
 CLASSES["AccountHandler"] = "snekmud.handlers.AccountHandler"
 CLASSES["GameSessionHandler"] = "snekmud.handlers.GameSessionHandler"
 CLASSES["PlayerCharacterHandler"] = "snekmud.handlers.PlayerCharacterHandler"
+CLASSES["autosave"] = "snekmud.autosave.AutosaveScheduler"
 
 EQUIP_CLASS_PATHS = list()
 
@@ -75,4 +76,14 @@ FUNCPARSER_PROTOTYPE_PARSING_MODULES = [
     "server.conf.prototypefuncs",
 ]
 
-GETTER_PATHS = ["snekmud.getters"]
\ No newline at end of file
+GETTER_PATHS = ["snekmud.getters"]
+
+# Autosave
+# Every active character is saved about once per AUTOSAVE_INTERVAL seconds (0 disables
+# autosaving). Saves are spread out: every AUTOSAVE_TICK seconds, a slice of the sessions
+# is written in one transaction. If a slice takes longer than AUTOSAVE_TICK_BUDGET seconds,
+# later slices shrink, but no character goes unsaved for more than AUTOSAVE_MAX_STALENESS.
+AUTOSAVE_INTERVAL = 300.0
+AUTOSAVE_TICK = 5.0
+AUTOSAVE_TICK_BUDGET = 0.05
+AUTOSAVE_MAX_STALENESS = 900.0
@@ -0,0 +1,53 @@
+"""
+Cached stat aggregation.
+
+Race, Sensei, ItemType, flags and worn equipment all feed a stat through
+Modifier.stat_bonus and Modifier.stat_multiplier. Summing those means walking every
+modifier component on the entity and on everything it has equipped, so the totals are
+cached per (entity, stat) here and dropped whenever something they depend on changes.
+"""
+from snekmud import WORLD, COMPONENTS, GETTER_FUNCS
+from snekmud.typing import Entity
+
+_STAT_CACHE: dict[Entity, dict[str, tuple[int, float]]] = dict()
+
+
+def stat_totals(ent: Entity, stat_name: str) -> tuple[int, float]:
+    """
+    Retrieve the summed (bonus, multiplier) for a stat, computing it via the
+    GetStatModifiers getter on a cache miss.
+    """
+    if (cached := _STAT_CACHE.get(ent, None)) is not None:
+        if (totals := cached.get(stat_name, None)) is not None:
+            return totals
+    else:
+        cached = _STAT_CACHE[ent] = dict()
+    totals = GETTER_FUNCS["GetStatModifiers"](ent, stat_name)
+    cached[stat_name] = totals
+    return totals
+
+
+def get_stat(ent: Entity, stat_name: str, base=0):
+    """
+    Apply every Modifier affecting stat_name to a base value.
+
+    Bonuses are added to the base first, and the summed multipliers then scale the result,
+    so two +10% modifiers give +20%.
+    """
+    bonus, mult = stat_totals(ent, stat_name)
+    return (base + bonus) * (1.0 + mult)
+
+
+def invalidate_stats(ent: Entity):
+    """
+    Forget cached totals for an entity. If it is worn by someone, their totals depend
+    on it too and are forgotten as well.
+    """
+    seen = set()
+    equipped = COMPONENTS["Equipped"]
+    while ent not in seen:
+        seen.add(ent)
+        _STAT_CACHE.pop(ent, None)
+        if not WORLD.entity_exists(ent) or not (eq := WORLD.try_component(ent, equipped)):
+            break
+        ent = eq.holder
@@ -0,0 +1,56 @@
+"""
+Tests for the autosave scheduler's interaction with sessions leaving play.
+
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest import mock
+from django.test import TestCase
+from snekmud import OPERATIONS
+from snekmud.autosave import AutosaveScheduler
+from snekmud.handlers import GameSessionHandler
+
+
+class TestAutosave(TestCase):
+
+    def setUp(self):
+        self.handler = GameSessionHandler(mock.Mock())
+        self.handler.character = self.handler.puppet = 1
+        self.handler.time_last_saved = 0.0
+        self.session = SimpleNamespace(pk=1, handler=self.handler)
+        patcher = mock.patch("snekmud.autosave.all_gamesessions", return_value=[self.session])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scheduler = AutosaveScheduler()
+
+    def test_extracting_character_is_not_due(self):
+        self.assertEqual([self.session], self.scheduler.due(time.monotonic()))
+        due_during = list()
+
+        class Extract:
+
+            def __init__(extract, ent):
+                self.assertEqual(1, ent)
+
+            async def execute(extract):
+                due_during.extend(self.scheduler.due(time.monotonic()))
+
+        with mock.patch.dict(OPERATIONS, {"ExtractEntity": Extract}):
+            asyncio.run(self.handler.extract_character())
+        self.assertEqual([], due_during)
+        self.assertIsNone(self.handler.character)
+        self.assertEqual([], self.scheduler.due(time.monotonic()))
+
+    def test_stop_cancels_task(self):
+        async def start_and_stop():
+            self.scheduler.start()
+            task = self.scheduler.task
+            self.scheduler.stop()
+            await asyncio.sleep(0)
+            return task
+
+        task = asyncio.run(start_and_stop())
+        self.assertTrue(task.cancelled())
+        self.assertIsNone(self.scheduler.task)
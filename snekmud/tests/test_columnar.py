@@ -0,0 +1,89 @@
+"""
+Tests for numpy-backed columnar components.
+
+"""
+
+from unittest import skipIf
+from django.test import TestCase
+from snekmud import WORLD
+from snekmud.columnar import np
+
+if np is not None:
+    from snekmud.columnar import ColumnComponent, ColumnStore
+
+    class Vitals(ColumnComponent):
+        hp: float = 100.0
+        level: int = 1
+
+
+@skipIf(np is None, "numpy is not installed")
+class TestColumnStore(TestCase):
+
+    def setUp(self):
+        self.store = ColumnStore({"hp": (np.dtype("float64"), 100.0)}, capacity=4)
+
+    def test_alloc_and_free_swaps_last_row(self):
+        for ent in (1, 2, 3):
+            self.store.alloc(ent, {"hp": float(ent)})
+        self.assertEqual({"hp": 1.0}, self.store.free(1))
+        self.assertEqual([3, 2], list(self.store.active()))
+        self.assertEqual({3: 0, 2: 1}, self.store.slots)
+        self.assertEqual([3.0, 2.0], list(self.store.column("hp")))
+        self.assertIsNone(self.store.free(1))
+
+    def test_grows_past_capacity(self):
+        for ent in range(10):
+            self.store.alloc(ent, {"hp": float(ent)} if ent % 2 else {})
+        self.assertEqual(16, self.store.capacity)
+        self.assertEqual(list(range(10)), list(self.store.active()))
+        self.assertEqual([100.0 if ent % 2 == 0 else float(ent) for ent in range(10)],
+                         list(self.store.column("hp")))
+
+
+@skipIf(np is None, "numpy is not installed")
+class TestColumnComponent(TestCase):
+
+    def tearDown(self):
+        WORLD.clear_database()
+
+    def test_insert_and_remove(self):
+        a = WORLD.create_entity(Vitals(hp=5.0))
+        b = WORLD.create_entity(Vitals(level=3))
+        self.assertEqual([a, b], list(Vitals.entities()))
+        Vitals.column("hp")[:] += 1
+        self.assertEqual(6.0, WORLD.component_for_entity(a, Vitals).hp)
+
+        removed = WORLD.remove_component(a, Vitals)
+        self.assertEqual([b], list(Vitals.entities()))
+        self.assertEqual((6.0, 1), (removed.hp, removed.level))
+        self.assertEqual((101.0, 3), (WORLD.component_for_entity(b, Vitals).hp,
+                                      WORLD.component_for_entity(b, Vitals).level))
+
+    def test_readd_to_same_entity(self):
+        comp = Vitals(hp=5.0)
+        ent = WORLD.create_entity(comp)
+        WORLD.add_component(ent, comp)
+        self.assertEqual([ent], list(Vitals.entities()))
+        self.assertEqual(5.0, comp.hp)
+
+    def test_refuses_second_entity(self):
+        comp = Vitals(hp=5.0)
+        a = WORLD.create_entity(comp)
+        b = WORLD.create_entity()
+        with self.assertRaises(ValueError):
+            WORLD.add_component(b, comp)
+        self.assertFalse(WORLD.has_component(b, Vitals))
+        self.assertEqual([a], list(Vitals.entities()))
+        self.assertEqual(5.0, comp.hp)
+
+    def test_clear_database_frees_rows(self):
+        comp = Vitals(hp=7.0)
+        WORLD.create_entity(comp)
+        WORLD.clear_database()
+        self.assertEqual(0, len(Vitals.entities()))
+        self.assertEqual(7.0, comp.hp)
+
+    def test_grows_past_default_capacity(self):
+        ents = [WORLD.create_entity(Vitals(level=i)) for i in range(100)]
+        self.assertEqual(ents, list(Vitals.entities()))
+        self.assertEqual(list(range(100)), [WORLD.component_for_entity(e, Vitals).level for e in ents])
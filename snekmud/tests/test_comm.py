@@ -0,0 +1,161 @@
+"""
+Tests for message distribution and pre-evaluated actor-stance templates.
+
+"""
+
+import asyncio
+from unittest import mock
+from parameterized import parameterized
+from django.test import TestCase
+from snekmud import WORLD, COMPONENTS, GETTERS, GETTER_FUNCS, OPERATIONS
+from snekmud.utils import callables_from_module, LazyMessage
+from snekmud.hooks import build_getter_funcs
+from snekmud.sessions import bind_session, unbind_session
+from snekmud import funcparser
+
+_PARSER = funcparser.FuncParser(funcparser.ACTOR_STANCE_CALLABLES)
+
+
+def display_name(viewer, ent):
+    return f"Name{ent}<{viewer}>"
+
+
+class _Handler:
+
+    def __init__(self):
+        self.sent = list()
+
+    def send(self, **kwargs):
+        self.sent.append(kwargs["line"])
+
+
+class _Session:
+
+    def __init__(self):
+        self.handler = _Handler()
+
+
+class _Setup(TestCase):
+
+    def setUp(self):
+        COMPONENTS.update(callables_from_module("snekmud.components"))
+        GETTERS.update(callables_from_module("snekmud.getters"))
+        OPERATIONS.update({k: v for k, v in callables_from_module("snekmud.operations.comm").items()
+                           if hasattr(v, "execute")})
+        build_getter_funcs()
+        GETTER_FUNCS["GetDisplayName"] = display_name
+        self.you, self.tom, self.other = (WORLD.create_entity(COMPONENTS["Name"](n)) for n in ("you", "tom", "x"))
+        self.mapping = {"you": self.you, "tom": self.tom}
+
+    def tearDown(self):
+        WORLD.clear_database()
+        build_getter_funcs()
+
+    def parse(self, text, receiver):
+        try:
+            return _PARSER.parse(text, raise_errors=True, caller=self.you, receiver=receiver, mapping=self.mapping)
+        except funcparser.ParsingError as err:
+            return type(err)
+
+
+class TestStanceTemplate(_Setup):
+
+    @parameterized.expand(
+        [
+            ("$You() $conj(smile) at $you(tom), and $pron(your) hat falls.",),
+            ("plain text",),
+            ("escaped \\$you() $$ and {tom}",),
+            ("$Pron(I, m) $conj(jump)! $Obj(tom)",),
+            ("$pron(yourself) $conj()",),
+        ]
+    )
+    def test_matches_parse(self, text):
+        template = funcparser.StanceTemplate.compile(text, caller=self.you, mapping=self.mapping)
+        self.assertIsNotNone(template)
+        for receiver in (self.you, self.tom, self.other):
+            self.assertEqual(self.parse(text, receiver), template.render(receiver))
+
+    @parameterized.expand(
+        [
+            ("$you($you())",),
+            ("$you(nobody)",),
+            ("$unknown(x)",),
+        ]
+    )
+    def test_falls_back(self, text):
+        self.assertIsNone(funcparser.StanceTemplate.compile(text, caller=self.you, mapping=self.mapping))
+
+    def test_viewer_dependent_gender(self):
+        def gender(viewer, target):
+            return "male" if viewer == self.tom else "female"
+
+        GETTER_FUNCS["Gender"] = gender
+        text = "$You() $conj(wave) at $pron(your) friend."
+        with mock.patch.object(GETTERS["Gender"], "viewer_dependent", True):
+            template = funcparser.StanceTemplate.compile(text, caller=self.you, mapping=self.mapping)
+        for receiver in (self.you, self.tom, self.other):
+            self.assertEqual(self.parse(text, receiver), template.render(receiver))
+        self.assertNotEqual(template.render(self.tom), template.render(self.other))
+
+
+class TestDistributeMessage(_Setup):
+
+    def distribute(self, text, recipients):
+        asyncio.run(OPERATIONS["DistributeMessage"](text, recipients, from_obj=self.you,
+                                                    mapping=dict(self.mapping)).execute())
+
+    @parameterized.expand(
+        [
+            ("$You() $conj(wave) at $you(tom).",),
+            # contains the template's own marker, so it is parsed per receiver.
+            ("$You() $conj(wave) \x00 at $you(tom).",),
+        ]
+    )
+    def test_sessions_get_parse_output(self, text):
+        sessions = dict()
+        for ent in (self.you, self.tom, self.other):
+            sessions[ent] = _Session()
+            bind_session(ent, sessions[ent])
+        try:
+            self.distribute(text, list(sessions))
+        finally:
+            for ent, sess in sessions.items():
+                unbind_session(ent, sess)
+        for ent, sess in sessions.items():
+            self.assertEqual([self.parse(text, ent).format_map(
+                {k: display_name(ent, v) for k, v in self.mapping.items()})], sess.handler.sent)
+
+    def test_fallback_errors_like_parse(self):
+        bind_session(self.tom, sess := _Session())
+        try:
+            with self.assertRaises(funcparser.ParsingError):
+                self.distribute("$you($you()) nested", [self.tom])
+        finally:
+            unbind_session(self.tom, sess)
+
+    def test_listeners(self):
+        received = dict()
+
+        class Listener(COMPONENTS["Receiver"]):
+            listener = True
+
+            def receive(self, msg, **kwargs):
+                received[self.entity] = msg
+
+        class LazyListener(Listener):
+            lazy_messages = True
+
+        WORLD.add_component(self.tom, Listener(), type_alias=COMPONENTS["Receiver"])
+        WORLD.add_component(self.other, LazyListener(), type_alias=COMPONENTS["Receiver"])
+        idle = WORLD.create_entity(COMPONENTS["Name"]("rock"))
+
+        render = mock.Mock(wraps=OPERATIONS["DistributeMessage"].render, autospec=True)
+        with mock.patch.object(OPERATIONS["DistributeMessage"], "render", lambda *args: render(*args)):
+            self.distribute("$You() $conj(wave).", [self.tom, self.other, idle])
+            # the lazy one hasn't been rendered yet, and the idle one never is.
+            self.assertEqual(1, render.call_count)
+            self.assertIsInstance(received[self.tom], str)
+            self.assertIsInstance(received[self.other], LazyMessage)
+            self.assertEqual(f"Name{self.you}<{self.other}> waves.", str(received[self.other]))
+            self.assertEqual(2, render.call_count)
+        self.assertNotIn(idle, received)
@@ -0,0 +1,78 @@
+"""
+Tests for the idmap instance cache's shared mode, size limit and statistics.
+
+"""
+
+import gc
+import threading
+from types import SimpleNamespace
+from django.test import TestCase, override_settings
+from snekmud.db.idmap import tls, cache_stats
+
+
+class _Row:
+
+    def __init__(self, pk):
+        self.pk = pk
+        self._state = SimpleNamespace(db="default")
+
+
+def _model(strong=True):
+    return type("Model", (), {"_meta": SimpleNamespace(proxy=False, use_strong_refs=strong, multi_db=False)})
+
+
+class TestIdMapCache(TestCase):
+
+    def setUp(self):
+        self.model = _model()
+
+    def get_in_thread(self, pk):
+        found = list()
+        thread = threading.Thread(target=lambda: found.append(tls.get_cached_instance(self.model, pk)))
+        thread.start()
+        thread.join()
+        return found[0]
+
+    def test_thread_mode_is_per_thread(self):
+        row = _Row(1)
+        tls.cache_instance(self.model, row)
+        self.assertIs(row, tls.get_cached_instance(self.model, 1))
+        self.assertIsNone(self.get_in_thread(1))
+
+    @override_settings(IDMAP_CACHE_MODE="shared")
+    def test_shared_mode_shares_instances(self):
+        row = _Row(1)
+        tls.cache_instance(self.model, row)
+        self.assertIs(row, self.get_in_thread(1))
+        self.assertIs(row, tls.get_or_cache_instance(self.model, _Row(1)))
+        self.assertEqual("shared", cache_stats()["mode"])
+
+    @override_settings(IDMAP_MAX_STRONG_REFS=2)
+    def test_lru_bounding(self):
+        rows = [_Row(pk) for pk in range(3)]
+        for row in rows:
+            tls.cache_instance(self.model, row)
+        cache = tls.get_cache(self.model)
+        self.assertEqual([1, 2], list(cache.recent))
+        # still in use, so the evicted row keeps its identity and comes back when read.
+        self.assertIs(rows[0], tls.get_cached_instance(self.model, 0))
+        self.assertEqual([2, 0], list(cache.recent))
+
+        del rows
+        gc.collect()
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(tls.get_cached_instance(self.model, 1))
+
+    @override_settings(IDMAP_MAX_STRONG_REFS=1)
+    def test_stats(self):
+        before = cache_stats()
+        tls.cache_instance(self.model, _Row(1))
+        tls.cache_instance(self.model, _Row(2))
+        tls.get_cached_instance(self.model, 2)
+        tls.get_cached_instance(self.model, 3)
+        # a miss, since the other thread has its own cache, but still counted.
+        self.get_in_thread(2)
+        after = cache_stats()
+        self.assertEqual(1, after["hits"] - before["hits"])
+        self.assertEqual(2, after["misses"] - before["misses"])
+        self.assertEqual(1, after["evictions"] - before["evictions"])
@@ -0,0 +1,71 @@
+"""
+Tests for memoization scopes.
+
+"""
+
+import asyncio
+from django.test import TestCase
+from snekmud import WORLD, COMPONENTS
+from snekmud.utils import callables_from_module
+from snekmud.memo import memo_scope, memoized, invalidate_memo
+
+
+class TestMemo(TestCase):
+
+    def setUp(self):
+        COMPONENTS.update(callables_from_module("snekmud.components"))
+        self.calls = 0
+
+        def has_name(ent):
+            self.calls += 1
+            return WORLD.has_component(ent, COMPONENTS["Name"])
+
+        self.has_name = memoized("HasName", has_name)
+        self.ent = WORLD.create_entity()
+
+    def tearDown(self):
+        WORLD.clear_database()
+
+    def test_no_scope(self):
+        self.has_name(self.ent)
+        self.has_name(self.ent)
+        self.assertEqual(2, self.calls)
+
+    def test_scope_caches(self):
+        with memo_scope():
+            self.has_name(self.ent)
+            with memo_scope():
+                self.has_name(self.ent)
+        self.assertEqual(1, self.calls)
+        self.has_name(self.ent)
+        self.assertEqual(2, self.calls)
+
+    def test_invalidate(self):
+        with memo_scope():
+            self.has_name(self.ent)
+            invalidate_memo()
+            self.has_name(self.ent)
+        self.assertEqual(2, self.calls)
+
+    def test_world_changes_invalidate(self):
+        with memo_scope():
+            self.assertFalse(self.has_name(self.ent))
+            WORLD.add_component(self.ent, COMPONENTS["Name"]("bob"))
+            self.assertTrue(self.has_name(self.ent))
+            WORLD.remove_component(self.ent, COMPONENTS["Name"])
+            self.assertFalse(self.has_name(self.ent))
+
+    def test_closed_scope_in_task(self):
+        async def later():
+            await asyncio.sleep(0)
+            return self.has_name(self.ent), self.has_name(self.ent)
+
+        async def main():
+            with memo_scope():
+                self.has_name(self.ent)
+                task = asyncio.create_task(later())
+            WORLD.add_component(self.ent, COMPONENTS["Name"]("bob"))
+            return await task
+
+        self.assertEqual((True, True), asyncio.run(main()))
+        self.assertEqual(3, self.calls)
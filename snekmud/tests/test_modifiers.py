@@ -0,0 +1,119 @@
+"""
+Tests for the modifier holder index and flag handlers.
+
+"""
+
+from django.test import TestCase
+import snekmud
+from snekmud import WORLD, COMPONENTS, MODIFIERS_NAMES, MODIFIERS_ID, MODIFIERS_HOLDERS, MODIFIERS_PREFIX
+from snekmud.utils import callables_from_module
+from snekmud.components import _MultiModifiers
+from snekmud.modifiers import Modifier, MultiModifier, find_modifier, register_modifier
+
+
+class TestFlags(_MultiModifiers):
+    pass
+
+
+class Dark(Modifier):
+    modifier_id = 1
+    category = "TestFlags"
+    name = "DARK"
+
+
+class NoMob(Modifier):
+    modifier_id = 2
+    category = "TestFlags"
+    name = "NO_MOB"
+
+
+class Darkness(Modifier):
+    modifier_id = 3
+    category = "TestFlags"
+    name = "DARKNESS"
+
+
+class Noisy(Modifier):
+    modifier_id = 4
+    category = "TestFlags"
+    name = "NOISY"
+
+
+class Flags(MultiModifier):
+    comp_name = "TestFlags"
+
+
+class TestModifierIndex(TestCase):
+
+    def setUp(self):
+        COMPONENTS.update(callables_from_module("snekmud.components"))
+        COMPONENTS["TestFlags"] = TestFlags
+        for m in (Dark, NoMob):
+            MODIFIERS_NAMES[m.category][m.get_name()] = m
+            MODIFIERS_ID[m.category][m.modifier_id] = m
+        self.a = WORLD.create_entity()
+        self.b = WORLD.create_entity()
+        Flags(self.a).add("DARK")
+        Flags(self.b).add_many(["DARK", "NO_MOB"])
+
+    def tearDown(self):
+        WORLD.clear_database()
+        for registry in (MODIFIERS_NAMES, MODIFIERS_ID, MODIFIERS_HOLDERS, MODIFIERS_PREFIX):
+            registry.pop("TestFlags", None)
+        COMPONENTS.pop("TestFlags", None)
+
+    def test_has(self):
+        self.assertTrue(Flags(self.a).has("DARK"))
+        self.assertTrue(Flags(self.a).has("dar"))
+        self.assertFalse(Flags(self.a).has(NoMob))
+        self.assertTrue(Flags(self.b).has_all("DARK", 2))
+        self.assertFalse(Flags(self.a).has_all("DARK", "NO_MOB"))
+        self.assertTrue(Flags(self.a).has_any("NO_MOB", "DARK"))
+
+    def test_has_does_not_add_component(self):
+        c = WORLD.create_entity(COMPONENTS["Name"]("c"))
+        self.assertFalse(Flags(c).has("DARK"))
+        self.assertFalse(Flags(c).has_all("DARK"))
+        self.assertFalse(Flags(c).has_any("DARK"))
+        self.assertEqual([], Flags(c).ids())
+        self.assertFalse(WORLD.has_component(c, TestFlags))
+
+    def test_query(self):
+        self.assertEqual({self.a, self.b}, Flags.query(all_of=["DARK"]))
+        self.assertEqual({self.a}, Flags.query(all_of=["DARK"], none_of=["NO_MOB"]))
+        self.assertEqual({self.b}, Flags.query(any_of=["NO_MOB"]))
+        self.assertEqual(set(), Flags.query(all_of=["NOT_A_FLAG"]))
+
+    def test_remove(self):
+        Flags(self.b).remove("NO_MOB")
+        self.assertEqual({self.a, self.b}, Flags.query(all_of=["DARK"], none_of=["NO_MOB"]))
+        self.assertNotIn(self.b, MODIFIERS_HOLDERS["TestFlags"][NoMob.modifier_id])
+
+    def test_remove_component(self):
+        comp = WORLD.remove_component(self.b, TestFlags)
+        self.assertNotIn(self.b, MODIFIERS_HOLDERS["TestFlags"][Dark.modifier_id])
+        self.assertEqual({self.a}, Flags.query(all_of=["DARK"]))
+
+        WORLD.add_component(self.b, comp)
+        self.assertEqual({self.a, self.b}, Flags.query(all_of=["DARK"]))
+
+    def test_delete_and_clear(self):
+        WORLD.delete_entity(self.a, immediate=True)
+        self.assertNotIn(self.a, MODIFIERS_HOLDERS["TestFlags"][Dark.modifier_id])
+        WORLD.clear_database()
+        self.assertEqual(set(), MODIFIERS_HOLDERS["TestFlags"][Dark.modifier_id])
+        self.assertEqual(set(), MODIFIERS_HOLDERS["TestFlags"][NoMob.modifier_id])
+
+    def test_prefix_lookup(self):
+        self.assertIs(Dark, find_modifier("TestFlags", "d"))
+        self.assertIs(NoMob, find_modifier("TestFlags", "no_"))
+        self.assertIsNone(find_modifier("TestFlags", "zz"))
+
+    def test_registered_after_lookup(self):
+        self.assertIsNone(find_modifier("TestFlags", "darkn"))
+        register_modifier(Darkness)
+        self.assertIs(Darkness, find_modifier("TestFlags", "darkn"))
+        self.assertIs(Dark, find_modifier("TestFlags", "dark"))
+
+        MODIFIERS_NAMES["TestFlags"]["NOISY"] = Noisy
+        self.assertIs(Noisy, find_modifier("TestFlags", "noi"))
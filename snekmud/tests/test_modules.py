@@ -0,0 +1,82 @@
+"""
+Tests for the per-prototype entity ID allocator.
+
+"""
+
+import tempfile
+from pathlib import Path
+from unittest import mock
+from django.test import TestCase
+from snekmud import modules
+from snekmud.modules import IDAllocator, id_number
+from snekmud.utils import write_json_file
+
+STORED = [
+    ([{"Name": "a sack", "EntityID": {"module_name": "zone", "prototype": "sack", "ent_id": "sack_41"},
+       "Inventory": [{"EntityID": {"module_name": "zone", "prototype": "coin", "ent_id": "coin_7"}},
+                     {"EntityID": {"module_name": "zone", "prototype": "coin", "ent_id": "coin_3"}}]}],
+     [["armor", "head", {"EntityID": {"module_name": "other", "prototype": "helm", "ent_id": "helm_900"}}]]),
+    (None, None),
+]
+
+
+class TestIDAllocator(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name)
+        modules._STORED_COUNTERS = None
+        patcher = mock.patch.object(modules, "PlayerCharacter")
+        self.pc = patcher.start()
+        self.pc.objects.values_list.return_value.iterator.return_value = iter(STORED)
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        modules._STORED_COUNTERS = None
+
+    def test_sequential(self):
+        alloc = IDAllocator("zone", self.path / "zone")
+        self.assertEqual(["sack_42", "sack_43"], alloc.reserve_ids("sack", 2))
+        self.assertEqual(range(44, 47), alloc.reserve("sack", 3))
+        self.assertEqual(["goblin_0"], alloc.reserve_ids("goblin"))
+
+    def test_restart_skips_to_high_water(self):
+        IDAllocator("zone", self.path / "zone").reserve_ids("goblin")
+        alloc = IDAllocator("zone", self.path / "zone")
+        self.assertEqual(["goblin_1001"], alloc.reserve_ids("goblin"))
+
+    def test_copyover_is_exact(self):
+        alloc = IDAllocator("zone", self.path / "zone")
+        alloc.reserve_ids("goblin", 5)
+        alloc.save(exact=True)
+        self.assertEqual(["goblin_5"], IDAllocator("zone", self.path / "zone").reserve_ids("goblin"))
+
+    def test_observe(self):
+        alloc = IDAllocator("zone", self.path / "zone")
+        alloc.observe("goblin", "goblin_5000")
+        alloc.observe("goblin", "hobgoblin_9000")
+        alloc.observe("goblin", "goblin")
+        self.assertEqual(["goblin_5001"], alloc.reserve_ids("goblin"))
+
+    def test_recover_above_stored(self):
+        zone = IDAllocator("zone", self.path / "zone")
+        other = IDAllocator("other", self.path / "other")
+        self.assertEqual(["coin_8"], zone.reserve_ids("coin"))
+        self.assertEqual(["sack_42"], zone.reserve_ids("sack"))
+        self.assertEqual(["helm_901"], other.reserve_ids("helm"))
+        self.assertEqual(["helm_0"], zone.reserve_ids("helm"))
+        # every module shares one scan.
+        self.assertEqual(1, self.pc.objects.values_list.call_count)
+
+    def test_no_recovery_with_counter_file(self):
+        (self.path / "zone").mkdir()
+        write_json_file(self.path / "zone" / IDAllocator.filename, {"goblin": 3})
+        self.assertEqual(["goblin_3"], IDAllocator("zone", self.path / "zone").reserve_ids("goblin"))
+        self.assertEqual(["coin_0"], IDAllocator("zone", self.path / "zone").reserve_ids("coin"))
+        self.pc.objects.values_list.assert_not_called()
+
+    def test_id_number(self):
+        self.assertEqual(12, id_number("big_rat", "big_rat_12"))
+        self.assertIsNone(id_number("rat", "big_rat_12"))
+        self.assertIsNone(id_number("rat", "rat_x"))
@@ -0,0 +1,108 @@
+"""
+Tests for entity templates, bulk spawning and the cache of serialized contents.
+
+"""
+
+from dataclasses import dataclass
+from dataclasses_json import dataclass_json
+from django.test import TestCase
+from snekmud import WORLD, COMPONENTS
+from snekmud.utils import callables_from_module
+from snekmud.components import _Save
+from snekmud.serialize import build_template, spawn_entities, serialize_entity, deserialize_entity, _SERIALIZED
+
+DATA = {
+    "Name": "a goblin",
+    "Description": "Short, green and ugly.",
+    "MetaTypes": {"types": ["npc"]},
+    "WearSlots": {"slots": ["head", "body"]},
+    "Owner": {"owner": -1},
+}
+
+DATA_ITEM = {
+    "Name": "a sword",
+    "MetaTypes": {"types": ["item"]},
+}
+
+
+@dataclass_json
+@dataclass
+class Owner(_Save):
+    owner: int = -1
+
+    @classmethod
+    def deserialize(cls, data, ent):
+        return cls(owner=ent)
+
+
+class TestSpawn(TestCase):
+
+    def setUp(self):
+        COMPONENTS.update(callables_from_module("snekmud.components"))
+        COMPONENTS["Owner"] = Owner
+
+    def tearDown(self):
+        WORLD.clear_database()
+        COMPONENTS.pop("Owner", None)
+
+    def test_matches_deserialize(self):
+        template = build_template(DATA)
+        spawned = spawn_entities(template, 3)
+        expected = serialize_entity(deserialize_entity(DATA))
+        for ent in spawned:
+            data = serialize_entity(ent)
+            self.assertEqual(ent, data.pop("Owner")["owner"])
+            self.assertEqual({k: v for k, v in expected.items() if k != "Owner"}, data)
+
+    def test_clones_do_not_share_state(self):
+        a, b = spawn_entities(build_template(DATA), 2)
+        meta = COMPONENTS["MetaTypes"]
+        WORLD.component_for_entity(a, meta).types.append("goblinoid")
+        self.assertEqual(["npc"], WORLD.component_for_entity(b, meta).types)
+        self.assertEqual(["npc"], DATA["MetaTypes"]["types"])
+
+    def test_derived_caches_not_copied(self):
+        template = build_template(DATA)
+        proto = next(entry.prototype for entry in template if entry.comp_class is COMPONENTS["Name"])
+        proto.rich
+        a, = spawn_entities(template, 1)
+        name = WORLD.component_for_entity(a, COMPONENTS["Name"])
+        self.assertNotIn("rich", name.__dict__)
+        self.assertEqual("a goblin", name.plain)
+
+    def test_only_opted_in_components_clone(self):
+        template = {entry.comp_class: entry for entry in build_template(DATA)}
+        self.assertIsNone(template[Owner].prototype)
+        self.assertIsNotNone(template[COMPONENTS["MetaTypes"]].prototype)
+
+
+class TestSerializeCache(TestCase):
+
+    def setUp(self):
+        COMPONENTS.update(callables_from_module("snekmud.components"))
+        self.holder = deserialize_entity({"Name": "a bag", "Inventory": [DATA_ITEM]})
+        self.item = WORLD.component_for_entity(self.holder, COMPONENTS["Inventory"]).inventory[0]
+
+    def tearDown(self):
+        WORLD.clear_database()
+
+    def saved_types(self):
+        return serialize_entity(self.holder)["Inventory"][0]["MetaTypes"]["types"]
+
+    def test_in_place_change_is_saved(self):
+        self.assertEqual(["item"], self.saved_types())
+        WORLD.component_for_entity(self.item, COMPONENTS["MetaTypes"]).types.append("magic")
+        self.assertEqual(["item", "magic"], self.saved_types())
+
+    def test_unchanged_data_is_reused(self):
+        first = serialize_entity(self.holder)["Inventory"][0]
+        self.assertIs(first, serialize_entity(self.holder)["Inventory"][0])
+
+    def test_entry_dropped_on_change_and_delete(self):
+        serialize_entity(self.holder)
+        self.assertIn(self.item, _SERIALIZED)
+        WORLD.add_component(self.item, COMPONENTS["Description"]("Shiny."))
+        self.assertNotIn(self.item, _SERIALIZED)
+        serialize_entity(self.holder)
+        WORLD.delete_entity(self.item, immediate=True)
+        self.assertNotIn(self.item, _SERIALIZED)
@@ -0,0 +1,65 @@
+"""
+Tests for cached stat totals.
+
+"""
+
+from django.test import TestCase
+from snekmud import WORLD, COMPONENTS, GETTERS, GETTER_FUNCS
+from snekmud.utils import callables_from_module
+from snekmud.hooks import build_getter_funcs
+from snekmud.components import _SingleModifier
+from snekmud.modifiers import Modifier
+from snekmud.stats import _STAT_CACHE
+
+
+class TestRace(_SingleModifier):
+    pass
+
+
+class Strong(Modifier):
+    modifier_id = 1
+
+    def stat_bonus(self, ent, stat_name) -> int:
+        return 5 if stat_name == "strength" else 0
+
+    def stat_multiplier(self, ent, stat_name) -> float:
+        return 0.5 if stat_name == "strength" else 0.0
+
+
+class TestStats(TestCase):
+
+    def setUp(self):
+        COMPONENTS.update(callables_from_module("snekmud.components"))
+        GETTERS.update(callables_from_module("snekmud.getters"))
+        build_getter_funcs()
+        self.ent = WORLD.create_entity(COMPONENTS["Name"]("bob"))
+
+    def tearDown(self):
+        WORLD.clear_database()
+        _STAT_CACHE.clear()
+
+    def strength(self, ent=None):
+        return GETTER_FUNCS["GetStat"](self.ent if ent is None else ent, "strength", 10)
+
+    def test_cached(self):
+        self.assertEqual(10, self.strength())
+        self.assertIn("strength", _STAT_CACHE[self.ent])
+
+    def test_add_and_remove_component(self):
+        self.assertEqual(10, self.strength())
+        WORLD.add_component(self.ent, TestRace(modifier=Strong(self.ent)))
+        self.assertEqual(22.5, self.strength())
+        WORLD.remove_component(self.ent, TestRace)
+        self.assertEqual(10, self.strength())
+
+    def test_equipped_item(self):
+        item = WORLD.create_entity(TestRace(modifier=Strong(None)))
+        self.assertEqual(10, self.strength())
+        eq = COMPONENTS["Equipment"]()
+        eq.equipment["hand"] = type("Slot", (), {"item": item, "category": "test"})()
+        WORLD.add_component(self.ent, eq)
+        WORLD.add_component(item, COMPONENTS["Equipped"](holder=self.ent, category="test", slot="hand"))
+        self.assertEqual(22.5, self.strength())
+
+        WORLD.remove_component(item, TestRace)
+        self.assertEqual(10, self.strength())
@@ -12,8 +12,11 @@ from mudforge.utils import make_iter
 from server.conf import settings
 import textwrap
 import re
+import functools
+import ast
+import copy
 from ast import literal_eval
-from simpleeval import simple_eval
+from simpleeval import simple_eval, DEFAULT_FUNCTIONS, DEFAULT_NAMES, DEFAULT_OPERATORS, MAX_STRING_LENGTH
 import json
 
 
@@ -49,6 +52,57 @@ def get_or_emplace(ent: Entity, component: typing.Type, *args, **kwargs) -> typi
     return c
 
 
+class LazyMessage:
+    """
+    A message which is only rendered when first converted to a string. Given to message
+    listeners without a session whose Receiver sets lazy_messages, since they often ignore
+    most of what they receive. It is not a str, so call str() before doing string things
+    with it.
+
+    Rendering after DistributeMessage has returned sees the world as it is then, rather than
+    as it was when the message was sent, and without the sender's memo scope.
+    """
+    __slots__ = ("_render", "_args", "_text")
+
+    def __init__(self, render: typing.Callable[..., str], *args):
+        self._render = render
+        self._args = args
+        self._text = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self._render(*self._args)
+            self._render = self._args = None
+        return self._text
+
+    def __repr__(self):
+        return f"<LazyMessage: {'rendered' if self._text is not None else 'pending'}>"
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __len__(self):
+        return len(str(self))
+
+    def __contains__(self, item):
+        return item in str(self)
+
+
+def delete_entities(entities: typing.Iterable[Entity]):
+    """
+    Delete many entities immediately. Entities that are already gone are skipped, and any
+    other entities waiting on deferred deletion are left alone.
+    """
+    for ent in entities:
+        try:
+            WORLD.delete_entity(ent, immediate=True)
+        except KeyError:
+            pass
+
+
 def mod_import_from_path(path):
     """
     Load a Python module at the specified path.
@@ -140,6 +194,55 @@ def callables_from_module(module):
     members = getmembers(mod, predicate=lambda obj: callable(obj) and getmodule(obj) == mod)
     return dict((key, val) for key, val in members if not key.startswith("_"))
 
+def fast_callable(cls) -> typing.Callable:
+    """
+    Resolve a Getter class into a plain callable which takes the constructor's arguments
+    and returns what execute() would.
+
+    If the class's fast() classmethod is defined at or below the class that defines
+    execute(), fast() is returned as-is. Otherwise, such as when a subclass overrides only
+    execute(), the callable falls back to creating an instance and calling execute().
+    """
+    fast_owner, exec_owner = _mro_owner(cls, "fast"), _mro_owner(cls, "execute")
+    if fast_owner and (exec_owner is None or issubclass(fast_owner, exec_owner)):
+        return cls.fast
+
+    def call(*args, **kwargs):
+        return cls(*args, **kwargs).execute()
+    call.__name__ = cls.__name__
+    call.__qualname__ = f"{cls.__qualname__}.execute"
+    return call
+
+
+def batch_callable(cls) -> typing.Callable:
+    """
+    Resolve a Getter class with a batch(subject, targets) classmethod into a callable that
+    returns the targets passing the Getter's check.
+
+    If a subclass overrides the scalar fast() or execute() below the class defining batch(),
+    the batch is assumed stale and the callable loops over the scalar path instead.
+    """
+    batch_owner = _mro_owner(cls, "batch")
+    scalar_owners = [o for o in (_mro_owner(cls, "fast"), _mro_owner(cls, "execute")) if o]
+    if all(issubclass(batch_owner, o) for o in scalar_owners):
+        return cls.batch
+
+    scalar = fast_callable(cls)
+
+    def call(subject, targets, **kwargs):
+        return [x for x in targets if scalar(subject, x, **kwargs)]
+    call.__name__ = cls.__name__
+    call.__qualname__ = f"{cls.__qualname__}.batch"
+    return call
+
+
+def _mro_owner(cls, attr: str):
+    for c in getmro(cls):
+        if attr in c.__dict__:
+            return c
+    return None
+
+
 def variable_from_module(module, variable=None, default=None):
     """
     Retrieve a variable or list of variables from a module. The
@@ -228,6 +331,73 @@ def to_str(text, session=None):
         return text.decode(default_encoding, errors="replace")
 
 
+# Evennia color/style markup and raw ANSI sequences. `||`, `|/`, `|-` and `|_` become a single
+# character (|, newline, tab and space); everything else takes no room on screen.
+_MARKUP_RE = re.compile(
+    r"\|[|/\-_]"
+    r"|\x1b\[[0-9;]*[A-Za-z]"
+    r"|\|\[?(?:[0-5]{3}|=[a-z]|#[0-9a-fA-F]{6}|[rgybmcwxRGYBMCWX])"
+    r"|\|[nhHu*^]"
+)
+_MARKUP_CHARS = {"||": "|", "|/": "\n", "|-": "\t", "|_": " "}
+_WIDTH_CACHE_SIZE = 8192
+
+
+def _has_markup(text: str) -> bool:
+    return "|" in text or "\x1b" in text
+
+
+def _token_width(token: str) -> int:
+    return 1 if token in _MARKUP_CHARS else 0
+
+
+@functools.lru_cache(maxsize=_WIDTH_CACHE_SIZE)
+def _markup_width(text: str) -> int:
+    width = len(text)
+    for m in _MARKUP_RE.finditer(text):
+        token = m.group()
+        width -= len(token) - _token_width(token)
+    return width
+
+
+def visible_width(text: str) -> int:
+    """
+    The number of characters text takes up on screen, ignoring Evennia color markup and ANSI
+    sequences. Measurements of marked-up strings are cached.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        width (int): The visible width.
+
+    """
+    if not _has_markup(text):
+        return len(text)
+    return _markup_width(text)
+
+
+def _split_visible(text: str, width: int) -> tuple[str, str]:
+    """
+    Split text after `width` visible characters. Markup is never split.
+    """
+    if not _has_markup(text):
+        return text[:width], text[width:]
+    pos, used = 0, 0
+    for m in _MARKUP_RE.finditer(text):
+        plain = m.start() - pos
+        if used + plain >= width:
+            break
+        used += plain
+        token_width = _token_width(m.group())
+        if used + token_width > width:
+            return text[: m.start()], text[m.start():]
+        used += token_width
+        pos = m.end()
+    cut = pos + (width - used)
+    return text[:cut], text[cut:]
+
+
 def wrap(text, width=None, indent=0):
     """
     Safely wrap text to a certain number of characters.
@@ -245,7 +415,28 @@ def wrap(text, width=None, indent=0):
     if not text:
         return ""
     indent = " " * indent
-    return to_str(textwrap.fill(text, width, initial_indent=indent, subsequent_indent=indent))
+    if not _has_markup(text):
+        return to_str(textwrap.fill(text, width, initial_indent=indent, subsequent_indent=indent))
+
+    # textwrap counts markup as text, so wrap marked-up text word by word instead.
+    room = max(1, width - len(indent))
+    lines, line, used = [], [], 0
+    for word in text.split():
+        wwidth = visible_width(word)
+        if line and used + 1 + wwidth > room:
+            lines.append(" ".join(line))
+            line, used = [], 0
+        while wwidth > room:
+            # break words too long to fit on a line of their own
+            head, word = _split_visible(word, room)
+            lines.append(head)
+            wwidth -= room
+        if word:
+            used += wwidth + (1 if line else 0)
+            line.append(word)
+    if line:
+        lines.append(" ".join(line))
+    return "\n".join(indent + line for line in lines)
 
 
 # alias - fill
@@ -254,7 +445,7 @@ fill = wrap
 
 def pad(text, width=None, align="c", fillchar=" "):
     """
-    Pads to a given width.
+    Pads to a given width. Markup in text doesn't count towards its width.
 
     Args:
         text (str): Text to pad.
@@ -270,18 +461,30 @@ def pad(text, width=None, align="c", fillchar=" "):
     width = width if width else settings.CLIENT_DEFAULT_WIDTH
     align = align if align in ("c", "l", "r") else "c"
     fillchar = fillchar[0] if fillchar else " "
+    if not _has_markup(text):
+        if align == "l":
+            return text.ljust(width, fillchar)
+        elif align == "r":
+            return text.rjust(width, fillchar)
+        else:
+            return text.center(width, fillchar)
+
+    marg = width - visible_width(text)
+    if marg <= 0:
+        return text
     if align == "l":
-        return text.ljust(width, fillchar)
+        return text + fillchar * marg
     elif align == "r":
-        return text.rjust(width, fillchar)
-    else:
-        return text.center(width, fillchar)
+        return fillchar * marg + text
+    # same split as str.center
+    left = marg // 2 + (marg & width & 1)
+    return fillchar * left + text + fillchar * (marg - left)
 
 
 def crop(text, width=None, suffix="[...]"):
     """
     Crop text to a certain width, throwing away text from too-long
-    lines.
+    lines. Markup in text doesn't count towards its width.
 
     Args:
         text (str): Text to crop.
@@ -297,13 +500,18 @@ def crop(text, width=None, suffix="[...]"):
 
     """
     width = width if width else settings.CLIENT_DEFAULT_WIDTH
-    ltext = len(text)
+    ltext = visible_width(text)
     if ltext <= width:
         return text
     else:
-        lsuffix = len(suffix)
-        text = text[:width] if lsuffix >= width else "%s%s" % (text[: width - lsuffix], suffix)
-        return to_str(text)
+        lsuffix = visible_width(suffix)
+        if lsuffix >= width:
+            return to_str(_split_visible(text, width)[0])
+        text = _split_visible(text, width - lsuffix)[0]
+        if _has_markup(text):
+            # don't let the suffix inherit the cropped text's colors
+            text += "|n"
+        return to_str(text + suffix)
 
 
 def dedent(text, baseline_index=None, indent=None):
@@ -351,7 +559,7 @@ def justify(text, width=None, align="f", indent=0):
     Fully justify a text so that it fits inside `width`. When using
     full justification (default) this will be done by padding between
     words with extra whitespace where necessary. Paragraphs will
-    be retained.
+    be retained. Markup in text doesn't count towards its width.
 
     Args:
         text (str): Text to justify.
@@ -402,35 +610,37 @@ def justify(text, width=None, align="f", indent=0):
         return gap.join(line)
 
     # split into paragraphs and words
-    paragraphs = re.split("\n\s*?\n", text, re.MULTILINE)
+    paragraphs = re.split(r"\n\s*?\n", text, flags=re.MULTILINE)
     words = []
     for ip, paragraph in enumerate(paragraphs):
         if ip > 0:
             words.append(("\n", 0))
-        words.extend((word, len(word)) for word in paragraph.split())
+        words.extend((word, visible_width(word)) for word in paragraph.split())
     ngaps, wlen, line = 0, 0, []
 
     lines = []
-    while words:
+    iword, nwords = 0, len(words)
+    while iword < nwords:
+        word, wwidth = words[iword]
         if not line:
             # start a new line
-            word = words.pop(0)
-            wlen = word[1]
-            line.append(word[0])
-        elif (words[0][1] + wlen + ngaps) >= width:
+            iword += 1
+            wlen = wwidth
+            line.append(word)
+        elif (wwidth + wlen + ngaps) >= width:
             # next word would exceed word length of line + smallest gaps
             lines.append(_process_line(line))
             ngaps, wlen, line = 0, 0, []
         else:
             # put a new word on the line
-            word = words.pop(0)
-            line.append(word[0])
-            if word[1] == 0:
+            iword += 1
+            line.append(word)
+            if word == "\n":
                 # a new paragraph, process immediately
                 lines.append(_process_line(line))
                 ngaps, wlen, line = 0, 0, []
             else:
-                wlen += word[1]
+                wlen += wwidth
                 ngaps += 1
 
     if line:  # catch any line left behind
@@ -442,7 +652,8 @@ def justify(text, width=None, align="f", indent=0):
 def columnize(string, columns=2, spacing=4, align="l", width=None):
     """
     Break a string into a number of columns, using as little
-    vertical space as possible.
+    vertical space as possible. Markup in string doesn't count towards
+    its width.
 
     Args:
         string (str): The string to columnize.
@@ -494,6 +705,96 @@ def columnize(string, columns=2, spacing=4, align="l", width=None):
 
     return "\n".join(rows)
 
+# Expressions for the "py" converter (and so $eval and the math callables) are compiled once
+# and cached. Literals are evaluated up front; anything else within simpleeval's defaults is
+# checked and compiled to bytecode, with the operators simpleeval guards (like ** and *)
+# routed through its guarded versions. Anything else falls back to simple_eval itself.
+_EXPR_CACHE_SIZE = 2048
+_IMMUTABLE_TYPES = (int, float, complex, str, bytes, bool, type(None))
+_GUARDED_OPERATORS = {
+    op: func
+    for op, func in DEFAULT_OPERATORS.items()
+    if issubclass(op, ast.operator) and getattr(func, "__module__", None) not in ("operator", "_operator")
+}
+_EXPR_GLOBALS = {
+    "__builtins__": {},
+    **DEFAULT_NAMES,
+    **DEFAULT_FUNCTIONS,
+    **{f"_op_{op.__name__}": func for op, func in _GUARDED_OPERATORS.items()},
+}
+
+
+class _UnsupportedExpression(Exception):
+    pass
+
+
+class _ExpressionCompiler(ast.NodeTransformer):
+    _allowed = (ast.Expression, ast.Constant, ast.Name, ast.Load, ast.UnaryOp, ast.BinOp,
+                ast.BoolOp, ast.And, ast.Or, ast.Compare, ast.IfExp, ast.Call, ast.keyword,
+                ast.Subscript, ast.Slice)
+
+    def generic_visit(self, node):
+        if not isinstance(node, self._allowed) and type(node) not in DEFAULT_OPERATORS:
+            raise _UnsupportedExpression(type(node).__name__)
+        return super().generic_visit(node)
+
+    def visit_Constant(self, node):
+        if hasattr(node.value, "__len__") and len(node.value) > MAX_STRING_LENGTH:
+            raise _UnsupportedExpression("Constant")
+        return node
+
+    def visit_Name(self, node):
+        if node.id not in DEFAULT_NAMES and node.id not in DEFAULT_FUNCTIONS:
+            raise _UnsupportedExpression(node.id)
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in DEFAULT_FUNCTIONS:
+            raise _UnsupportedExpression("Call")
+        if any(kw.arg is None for kw in node.keywords):
+            raise _UnsupportedExpression("Call")
+        return self.generic_visit(node)
+
+    def visit_BinOp(self, node):
+        node = self.generic_visit(node)
+        if (op := type(node.op)) in _GUARDED_OPERATORS:
+            return ast.Call(ast.Name(f"_op_{op.__name__}", ast.Load()), [node.left, node.right], [])
+        return node
+
+    def compile(self, expr: str):
+        tree = self.visit(ast.parse(expr.strip(), mode="eval"))
+        return compile(ast.fix_missing_locations(tree), "<expression>", "eval")
+
+
+@functools.lru_cache(maxsize=_EXPR_CACHE_SIZE)
+def compile_expression(expr: str) -> tuple[typing.Callable[[], typing.Any], str | None]:
+    """
+    Compile expr as the "py" converter understands it.
+
+    Args:
+        expr (str): A Python literal or simple expression.
+
+    Returns:
+        tuple: `(evaluate, literal_err)`. Calling `evaluate()` returns the value of expr or
+            raises. literal_err is the error literal_eval gave, or None if expr is a literal.
+
+    """
+    try:
+        value = literal_eval(expr)
+    except Exception as err:
+        literal_err = f"{err.__class__.__name__}: {err}"
+    else:
+        if isinstance(value, _IMMUTABLE_TYPES):
+            return (lambda: value), None
+        return functools.partial(copy.deepcopy, value), None
+
+    try:
+        code = _ExpressionCompiler().compile(expr)
+    except Exception:
+        return functools.partial(simple_eval, expr), literal_err
+    return functools.partial(eval, code, _EXPR_GLOBALS), literal_err
+
+
 def safe_convert_to_types(converters, *args, raise_errors=True, **kwargs):
     """
     Helper function to safely convert inputs to expected data types.
@@ -547,15 +848,11 @@ def safe_convert_to_types(converters, *args, raise_errors=True, **kwargs):
             # already converted
             return inp
 
+        evaluate, literal_err = compile_expression(inp)
         try:
-            return literal_eval(inp)
+            return evaluate()
         except Exception as err:
-            literal_err = f"{err.__class__.__name__}: {err}"
-            try:
-                return simple_eval(inp)
-            except Exception as err:
-                simple_err = f"{str(err.__class__.__name__)}: {err}"
-                pass
+            simple_err = f"{str(err.__class__.__name__)}: {err}"
 
         if raise_errors:
             from .funcparser import ParsingError
@@ -0,0 +1,159 @@
+"""
+Compiles verbs.txt into verbs.idx, a binary lookup table which conjugate.py memory-maps
+instead of building dicts of every verb form at import time.
+
+The index is rebuilt automatically when verbs.txt changes, but can be regenerated by hand:
+
+    python -m snekmud.verb_conjugation.compile [--force] [source] [target]
+
+Layout (native byte order, all integers unsigned 32-bit unless noted):
+
+    header      MAGIC, byteorder (1 byte), padding, source size and mtime_ns (64-bit),
+                then string count, row count, field count and the offsets of each section
+    string_offs string_count + 1 offsets into the string pool
+    pool        every distinct form, utf-8, sorted; a string's id is its position
+    row_of      per string id, the verb row it is the infinitive of, or NONE
+    lemma_of    per string id, the string id of its infinitive, or NONE
+    row_offs    row_count + 1 offsets into fields
+    fields      per row, the string ids of its forms, as in verbs.txt
+
+Since the pool is sorted, finding a word is a binary search over it; everything else is an
+array lookup.
+"""
+import os
+import struct
+import sys
+from pathlib import Path
+
+VERBS_FILE = Path(__file__).parent / "verbs.txt"
+INDEX_FILE = VERBS_FILE.with_suffix(".idx")
+
+MAGIC = b"SNKVERB1"
+NONE = 0xFFFFFFFF
+_HEADER = struct.Struct("=8sc7xQQ9I")
+_BYTEORDER = b"<" if sys.byteorder == "little" else b">"
+
+
+def parse_verbs(source: Path = VERBS_FILE) -> tuple[dict, dict]:
+    """
+    Parse verbs.txt into the verb_tenses and verb_lemmas dicts conjugate.py used to build.
+    """
+    verb_tenses = {}
+    with open(source) as fil:
+        for line in fil.readlines():
+            wordlist = [part.strip() for part in line.split(",")]
+            verb_tenses[wordlist[0]] = wordlist
+
+    verb_lemmas = {}
+    for infinitive in verb_tenses:
+        for tense in verb_tenses[infinitive]:
+            if tense:
+                verb_lemmas[tense] = infinitive
+    return verb_tenses, verb_lemmas
+
+
+def _u32(values) -> bytes:
+    return struct.pack(f"={len(values)}I", *values)
+
+
+def compile_verbs(source: Path = VERBS_FILE) -> bytes:
+    """
+    Build the index for source.
+
+    Returns:
+        bytes: The compiled index.
+    """
+    st = os.stat(source)
+    verb_tenses, verb_lemmas = parse_verbs(source)
+
+    strings = set(verb_lemmas.values())
+    for row in verb_tenses.values():
+        strings.update(row)
+    strings = sorted(strings, key=lambda x: x.encode("utf-8"))
+    ids = {s: i for i, s in enumerate(strings)}
+
+    encoded = [s.encode("utf-8") for s in strings]
+    string_offs = [0]
+    for e in encoded:
+        string_offs.append(string_offs[-1] + len(e))
+    pool = b"".join(encoded)
+    pool += b"\0" * (-len(pool) % 4)
+
+    row_of = [NONE] * len(strings)
+    row_offs = [0]
+    fields = list()
+    for r, (infinitive, row) in enumerate(verb_tenses.items()):
+        row_of[ids[infinitive]] = r
+        fields.extend(ids[f] for f in row)
+        row_offs.append(len(fields))
+
+    lemma_of = [NONE] * len(strings)
+    for form, infinitive in verb_lemmas.items():
+        lemma_of[ids[form]] = ids[infinitive]
+
+    sections = [_u32(string_offs), pool, _u32(row_of), _u32(lemma_of), _u32(row_offs), _u32(fields)]
+    offsets = list()
+    pos = _HEADER.size
+    for sec in sections:
+        offsets.append(pos)
+        pos += len(sec)
+
+    header = _HEADER.pack(MAGIC, _BYTEORDER, st.st_size, st.st_mtime_ns,
+                          len(strings), len(verb_tenses), len(fields), *offsets)
+    return header + b"".join(sections)
+
+
+def read_header(buffer) -> dict:
+    magic, byteorder, size, mtime_ns, *rest = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or byteorder != _BYTEORDER:
+        raise ValueError("Not a verb index for this platform.")
+    keys = ("strings", "rows", "fields", "string_offs", "pool", "row_of", "lemma_of", "row_offs", "field_ids")
+    return {"size": size, "mtime_ns": mtime_ns, **dict(zip(keys, rest))}
+
+
+def is_current(target: Path = INDEX_FILE, source: Path = VERBS_FILE) -> bool:
+    try:
+        with open(target, "rb") as f:
+            header = read_header(f.read(_HEADER.size))
+    except (OSError, ValueError, struct.error):
+        return False
+    st = os.stat(source)
+    return header["size"] == st.st_size and header["mtime_ns"] == st.st_mtime_ns
+
+
+def write_index(source: Path = VERBS_FILE, target: Path = INDEX_FILE) -> bytes:
+    """
+    Compile source and atomically replace target with the result. Raises OSError if target
+    can't be written; the compiled bytes are attached to the exception as `data`.
+    """
+    data = compile_verbs(source)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+    except OSError as err:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        err.data = data
+        raise
+    return data
+
+
+def main(args=None):
+    args = list(sys.argv[1:] if args is None else args)
+    force = "--force" in args
+    args = [a for a in args if a != "--force"]
+    source = Path(args[0]) if args else VERBS_FILE
+    target = Path(args[1]) if len(args) > 1 else source.with_suffix(".idx")
+    if not force and is_current(target, source):
+        print(f"{target} is up to date.")
+        return
+    data = write_index(source, target)
+    print(f"Wrote {target} ({len(data)} bytes).")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,9 +12,27 @@ http://www.cis.upenn.edu/~xtag/
 
 """
 
-import os
-
-_VERBS_FILE = "verbs.txt"
+import functools
+import mmap
+from collections.abc import Mapping
+from .compile import VERBS_FILE, INDEX_FILE, NONE, read_header, is_current, write_index, compile_verbs
+
+# How many verbs to remember actor-stance forms for. Emotes use a small vocabulary.
+CACHE_SIZE = 2048
+
+# Conjugated once at startup so the first messages don't pay for the lookups.
+COMMON_VERBS = (
+    "be", "is", "are", "was", "were", "have", "has", "had", "do", "does", "did",
+    "say", "says", "said", "ask", "asks", "tell", "tells", "whisper", "whispers", "shout", "shouts",
+    "yell", "yells", "go", "goes", "went", "come", "comes", "leave", "leaves", "arrive", "arrives",
+    "enter", "enters", "walk", "walks", "run", "runs", "look", "looks", "see", "sees", "get", "gets",
+    "take", "takes", "drop", "drops", "give", "gives", "put", "puts", "wear", "wears", "wield",
+    "wields", "remove", "removes", "open", "opens", "close", "closes", "hit", "hits", "miss",
+    "misses", "attack", "attacks", "kill", "kills", "die", "dies", "flee", "flees", "smile",
+    "smiles", "grin", "grins", "laugh", "laughs", "nod", "nods", "wave", "waves", "sigh", "sighs",
+    "shrug", "shrugs", "bow", "bows", "eat", "eats", "drink", "drinks", "sit", "sits", "stand",
+    "stands", "sleep", "sleeps", "wake", "wakes", "become", "becomes", "stop", "stops",
+)
 
 # Each verb and its tenses is a list in verbs.txt,
 # indexed according to the following keys:
@@ -58,23 +76,131 @@ verb_tenses_aliases = {
 # Additionally, the following verbs can be negated:
 # be, can, do, will, must, have, may, need, dare, ought.
 
-# load the conjugation forms from ./verbs.txt
-verb_tenses = {}
+# The conjugation forms from ./verbs.txt are compiled into ./verbs.idx (see compile.py),
+# which is memory-mapped on first use. verb_tenses maps each infinitive to the list of its
+# forms and verb_lemmas maps inflected forms to their infinitive, as plain dicts used to.
 
-path = os.path.join(os.path.dirname(__file__), _VERBS_FILE)
-with open(path) as fil:
-    for line in fil.readlines():
-        wordlist = [part.strip() for part in line.split(",")]
-        verb_tenses[wordlist[0]] = wordlist
 
-# Each verb can be lemmatised:
-# inflected morphs of the verb point
-# to its infinitive in this dictionary.
-verb_lemmas = {}
-for infinitive in verb_tenses:
-    for tense in verb_tenses[infinitive]:
-        if tense:
-            verb_lemmas[tense] = infinitive
+class _VerbIndex:
+    """
+    Read access to a compiled verb index held in a buffer (normally an mmap).
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        h = read_header(buffer)
+        mv = memoryview(buffer)
+
+        def u32(offset, count):
+            return mv[offset:offset + 4 * count].cast("I")
+
+        self.count = h["strings"]
+        self.rows = h["rows"]
+        self.string_offs = u32(h["string_offs"], h["strings"] + 1)
+        self.pool = mv[h["pool"]:h["pool"] + self.string_offs[h["strings"]]]
+        self.row_of = u32(h["row_of"], h["strings"])
+        self.lemma_of = u32(h["lemma_of"], h["strings"])
+        self.row_offs = u32(h["row_offs"], h["rows"] + 1)
+        self.field_ids = u32(h["field_ids"], h["fields"])
+
+    def string(self, sid):
+        return str(self.pool[self.string_offs[sid]:self.string_offs[sid + 1]], "utf-8")
+
+    def find(self, word):
+        """
+        Returns the string id of word, or None.
+        """
+        if not isinstance(word, str):
+            return None
+        target = word.encode("utf-8")
+        offs, pool = self.string_offs, self.pool
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            found = pool[offs[mid]:offs[mid + 1]].tobytes()
+            if found < target:
+                lo = mid + 1
+            elif found > target:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def row(self, r):
+        string = self.string
+        return [string(sid) for sid in self.field_ids[self.row_offs[r]:self.row_offs[r + 1]]]
+
+
+_INDEX = None
+
+
+def _open_index():
+    if not is_current(INDEX_FILE, VERBS_FILE):
+        try:
+            write_index(VERBS_FILE, INDEX_FILE)
+        except OSError as err:
+            # can't write next to verbs.txt; keep the compiled index in memory instead.
+            if (data := getattr(err, "data", None)) is None:
+                raise
+            return data
+    try:
+        with open(INDEX_FILE, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return compile_verbs(VERBS_FILE)
+
+
+def _index():
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = _VerbIndex(_open_index())
+    return _INDEX
+
+
+class _VerbTenses(Mapping):
+    """
+    infinitive -> list of forms, in verbs.txt column order.
+    """
+
+    def __getitem__(self, verb):
+        idx = _index()
+        if (sid := idx.find(verb)) is None or (r := idx.row_of[sid]) == NONE:
+            raise KeyError(verb)
+        return idx.row(r)
+
+    def __iter__(self):
+        idx = _index()
+        for r in range(idx.rows):
+            yield idx.string(idx.field_ids[idx.row_offs[r]])
+
+    def __len__(self):
+        return _index().rows
+
+
+class _VerbLemmas(Mapping):
+    """
+    inflected form -> infinitive. Iterates in sorted order.
+    """
+
+    def __getitem__(self, verb):
+        idx = _index()
+        if (sid := idx.find(verb)) is None or (lemma := idx.lemma_of[sid]) == NONE:
+            raise KeyError(verb)
+        return idx.string(lemma)
+
+    def __iter__(self):
+        idx = _index()
+        for sid in range(idx.count):
+            if idx.lemma_of[sid] != NONE:
+                yield idx.string(sid)
+
+    def __len__(self):
+        idx = _index()
+        return sum(1 for sid in range(idx.count) if idx.lemma_of[sid] != NONE)
+
+
+verb_tenses = _VerbTenses()
+verb_lemmas = _VerbLemmas()
 
 
 def verb_infinitive(verb):
@@ -363,6 +489,7 @@ def verb_is_past_participle(verb):
     return tense == "past participle"
 
 
+@functools.lru_cache(maxsize=CACHE_SIZE)
 def verb_actor_stance_components(verb):
     """
     Figure out actor stance components of a verb.
@@ -385,3 +512,27 @@ def verb_actor_stance_components(verb):
         you_str = verb_past(verb, person="2") or verb
         them_str = verb_past(verb, person="3") or verb + "s"
     return (you_str, them_str)
+
+
+def warm_cache(verbs=COMMON_VERBS):
+    """
+    Pre-compute the actor-stance forms of verbs.
+    """
+    for verb in verbs:
+        verb_actor_stance_components(verb)
+
+
+def cache_stats():
+    """
+    Returns:
+        dict: Hits, misses, size and hit rate of the actor-stance cache.
+    """
+    info = verb_actor_stance_components.cache_info()
+    total = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": info.hits / total if total else 0.0,
+    }
@@ -28,8 +28,12 @@ viewpoint/pronouns    Subject  Object    Possessive  Possessive  Reflexive
 > `*`) Not formally used, we use `theirs` here as a filler.
 
 """
+import functools
 from snekmud.utils import copy_word_case
 
+# How many (pronoun, differentiators) combinations to remember.
+CACHE_SIZE = 2048
+
 DEFAULT_PRONOUN_TYPE = "object_pronoun"
 DEFAULT_VIEWPOINT = "2nd person"
 DEFAULT_GENDER = "neutral"
@@ -321,13 +325,55 @@ def pronoun_to_viewpoints(
     if not pronoun:
         return pronoun
 
+    if pronoun == "I":
+        pronoun_lower = "I"
+    else:
+        pronoun_lower = pronoun.lower()
+
+    if isinstance(options, list):
+        options = tuple(options)
+    try:
+        key = (pronoun_lower, *_normalize_differentiators(options, pronoun_type, gender, viewpoint))
+    except TypeError:
+        # unhashable options; let the reference implementation sort it out.
+        return _reference_pronoun_to_viewpoints(pronoun, options, pronoun_type, gender, viewpoint)
+
+    if (found := _PRONOUN_TABLE.get(key, None)) is None:
+        return pronoun
+
+    if pronoun is pronoun_lower or pronoun == pronoun_lower:
+        return found[0]
+    mapped, viewpoint = found[1]
+    return _apply_viewpoint(pronoun, mapped, viewpoint)
+
+
+def _reference_pronoun_to_viewpoints(
+    pronoun, options=None, pronoun_type="object_pronoun", gender="neutral", viewpoint="2nd person"
+):
+    """
+    The uncached, step-by-step implementation of pronoun_to_viewpoints, which the lookup
+    table is built from and tested against.
+    """
+    if not pronoun:
+        return pronoun
+
     pronoun_lower = "I" if pronoun == "I" else pronoun.lower()
 
     if pronoun_lower not in PRONOUN_MAPPING:
         return pronoun
 
-    # differentiators
+    pronoun_type, viewpoint, gender = _normalize_differentiators.__wrapped__(
+        options, pronoun_type, gender, viewpoint
+    )
+    mapped_pronoun, viewpoint = _map_pronoun(pronoun_lower, pronoun_type, viewpoint, gender)
+    return _apply_viewpoint(pronoun, mapped_pronoun, viewpoint)
 
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _normalize_differentiators(options, pronoun_type, gender, viewpoint):
+    """
+    Resolve options and the default differentiators into (pronoun_type, viewpoint, gender).
+    """
     if pronoun_type not in PRONOUN_TYPES:
         pronoun_type = DEFAULT_PRONOUN_TYPE
     if viewpoint not in VIEWPOINTS:
@@ -349,8 +395,16 @@ def pronoun_to_viewpoints(
                 viewpoint = opt
             elif opt in GENDERS:
                 gender = opt
+    return pronoun_type, viewpoint, gender
 
-    # step down into the mapping, using differentiators as needed
+
+def _map_pronoun(pronoun_lower, pronoun_type, viewpoint, gender):
+    """
+    Step down into PRONOUN_MAPPING using the differentiators as needed.
+
+    Returns:
+        tuple: (mapped pronoun, the viewpoint it was mapped to).
+    """
     pronoun_types = PRONOUN_MAPPING[pronoun_lower]
     # this has one or more pronoun-types
     if len(pronoun_types) == 1:
@@ -387,7 +441,10 @@ def pronoun_to_viewpoints(
     else:
         # not enough info - grab first mapping
         gender, mapped_pronoun = next(iter(genders.items()))
+    return mapped_pronoun, viewpoint
 
+
+def _apply_viewpoint(pronoun, mapped_pronoun, viewpoint):
     # keep the same capitalization as the original
     if pronoun != "I":
         # don't remap I, since this is always capitalized.
@@ -403,3 +460,51 @@ def pronoun_to_viewpoints(
         # the remapped viewpoint is 1st or 2nd person, so ingoing must have been
         # in 3rd person form.
         return mapped_pronoun, pronoun
+
+
+def _build_table():
+    """
+    Map every (pronoun, pronoun_type, viewpoint, gender) that _normalize_differentiators can
+    produce to ((1st/2nd, 3rd) for the pronoun as written in PRONOUN_MAPPING,
+    (mapped pronoun, mapped viewpoint) for re-casing other spellings).
+    """
+    table = dict()
+    for pronoun_lower in PRONOUN_MAPPING:
+        for pronoun_type in PRONOUN_TYPES + [DEFAULT_PRONOUN_TYPE]:
+            for viewpoint in VIEWPOINTS:
+                for gender in GENDERS:
+                    mapped = _map_pronoun(pronoun_lower, pronoun_type, viewpoint, gender)
+                    table[(pronoun_lower, pronoun_type, viewpoint, gender)] = (
+                        _apply_viewpoint(pronoun_lower, *mapped), mapped)
+    return table
+
+
+_PRONOUN_TABLE = _build_table()
+
+
+def warm_cache(pronoun_type="subject pronoun", viewpoint="2nd person"):
+    """
+    Pre-resolve every single option and alias against the pronoun type and viewpoint $pron()
+    defaults to, for every gender.
+    """
+    for opt in [None, *ALIASES, *PRONOUN_TYPES, *VIEWPOINTS, *GENDERS]:
+        for g in GENDERS:
+            _normalize_differentiators(opt, pronoun_type, g, viewpoint)
+
+
+def cache_stats():
+    """
+    Returns:
+        dict: Hits, misses, size and hit rate of the options normalization cache, and the
+            number of entries in the pronoun table.
+    """
+    info = _normalize_differentiators.cache_info()
+    total = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": info.hits / total if total else 0.0,
+        "table_size": len(_PRONOUN_TABLE),
+    }
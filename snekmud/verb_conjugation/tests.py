@@ -314,3 +314,66 @@ class TestPronounMapping(TestCase):
 
         self.assertEqual(expected_1st_or_2nd_person, received_1st_or_2nd_person)
         self.assertEqual(expected_3rd_person, received_3rd_person)
+
+
+class TestPronounTable(TestCase):
+    """
+    Test the precomputed pronoun table against the reference implementation.
+
+    """
+
+    spellings = [
+        spelling
+        for pronoun in list(pronouns.PRONOUN_MAPPING) + ["i", "nobody", ""]
+        for spelling in {pronoun, pronoun.lower(), pronoun.title(), pronoun.upper(), pronoun[:1] + pronoun[1:].upper()}
+    ]
+    tokens = list(pronouns.ALIASES) + pronouns.PRONOUN_TYPES + pronouns.VIEWPOINTS + pronouns.GENDERS + ["bogus"]
+
+    @staticmethod
+    def _result_of(func, args):
+        try:
+            return func(*args)
+        except Exception as err:
+            return type(err)
+
+    def _mismatches(self, cases):
+        out = []
+        for args in cases:
+            expected = self._result_of(pronouns._reference_pronoun_to_viewpoints, args)
+            received = self._result_of(pronouns.pronoun_to_viewpoints, args)
+            if expected != received:
+                out.append((args, expected, received))
+        return out
+
+    def test_all_differentiators(self):
+        """
+        Every pronoun spelling against every pronoun type, gender and viewpoint, valid or not.
+
+        """
+        cases = [
+            (pronoun, None, pronoun_type, gender, viewpoint)
+            for pronoun in self.spellings
+            for pronoun_type in pronouns.PRONOUN_TYPES + [pronouns.DEFAULT_PRONOUN_TYPE, "bogus"]
+            for gender in pronouns.GENDERS + ["bogus"]
+            for viewpoint in pronouns.VIEWPOINTS + ["bogus"]
+        ]
+        self.assertEqual([], self._mismatches(cases))
+
+    def test_all_options(self):
+        """
+        Every pronoun against every pair of options, as strings and lists. Spellings are
+        covered by test_all_differentiators.
+
+        """
+        option_sets = [None, "", []] + [
+            options
+            for first in self.tokens
+            for second in [None] + self.tokens
+            for options in ((first,), f"{first} {second}" if second else first, [first, second] if second else [first])
+        ]
+        cases = [
+            (pronoun, options, "subject pronoun", "neutral", "2nd person")
+            for pronoun in list(pronouns.PRONOUN_MAPPING) + ["nobody"]
+            for options in option_sets
+        ]
+        self.assertEqual([], self._mismatches(cases))
@@ -0,0 +1,165 @@
+import esper
+import itertools
+import typing
+from collections import defaultdict
+from snekmud.typing import Entity
+from snekmud.memo import invalidate_memo
+
+_clock = itertools.count(1)
+
+
+class SnekWorld(esper.World):
+    """
+    An esper World which can maintain views: the set of entities having every component
+    in a signature. Views are kept current as components are added and removed, so
+    iterating one costs O(matches) instead of intersecting component sets per query, and
+    they survive the cache clears that esper performs on every change.
+
+    Components which define at_world_add(ent) or at_world_remove(ent) are told when they
+    are attached to or detached from an entity. at_world_pre_add(ent) is called before
+    anything changes, and may raise to refuse the component.
+
+    Each entity also has a version, bumped whenever a component is added to or removed from
+    it, or touch() is called. Any such change, or deleting an entity, also invalidates the
+    current snekmud.memo scope, and drops the entity from every dict passed to
+    register_entity_cache().
+    """
+
+    def __init__(self, timed=False):
+        super().__init__(timed=timed)
+        self._views: dict[frozenset, set[Entity]] = dict()
+        self._views_by_type: dict[typing.Type, list[frozenset]] = defaultdict(list)
+        self._versions: dict[Entity, int] = dict()
+        self._entity_caches: list[dict] = list()
+
+    def register_entity_cache(self, cache: dict) -> dict:
+        """
+        Have entries keyed by an entity dropped from cache when it changes. Returns cache.
+        """
+        self._entity_caches.append(cache)
+        return cache
+
+    def _forget(self, entity: Entity):
+        self._versions[entity] = next(_clock)
+        for cache in self._entity_caches:
+            cache.pop(entity, None)
+        invalidate_memo()
+
+    def touch(self, entity: Entity):
+        self._versions[entity] = next(_clock)
+
+    def entity_version(self, entity: Entity) -> int:
+        return self._versions.get(entity, 0)
+
+    def register_view(self, *component_types: typing.Type) -> frozenset:
+        """
+        Start maintaining a view for the given component types, if it isn't already.
+
+        Returns:
+            signature (frozenset): The view's key.
+        """
+        signature = frozenset(component_types)
+        if signature in self._views:
+            return signature
+        sets = [self._components.get(t, set()) for t in signature]
+        self._views[signature] = set.intersection(*sets) if sets else set()
+        for t in signature:
+            self._views_by_type[t].append(signature)
+        return signature
+
+    def view(self, *component_types: typing.Type) -> list[Entity]:
+        """
+        Return every entity which has all of component_types. The view is registered on
+        first use. The result is a snapshot, so it is safe to change components while
+        iterating it.
+        """
+        signature = frozenset(component_types)
+        if (found := self._views.get(signature, None)) is None:
+            found = self._views[self.register_view(*component_types)]
+        return list(found)
+
+    def view_components(self, *component_types: typing.Type) -> typing.Iterator[tuple[Entity, list]]:
+        """
+        Like esper's get_components(), but iterates over a maintained view.
+        """
+        entity_db = self._entities
+        for ent in self.view(*component_types):
+            if (comps := entity_db.get(ent, None)) is not None:
+                yield ent, [comps[t] for t in component_types]
+
+    def _view_add(self, entity: Entity, component_type: typing.Type):
+        if not (signatures := self._views_by_type.get(component_type, None)):
+            return
+        have = self._entities[entity]
+        for signature in signatures:
+            if all(t in have for t in signature):
+                self._views[signature].add(entity)
+
+    def _view_discard(self, entity: Entity, component_types: typing.Iterable[typing.Type]):
+        views_by_type = self._views_by_type
+        for t in component_types:
+            for signature in views_by_type.get(t, ()):
+                self._views[signature].discard(entity)
+
+    def create_entity(self, *components) -> Entity:
+        entity = super().create_entity()
+        for component_instance in components:
+            self.add_component(entity, component_instance)
+        return entity
+
+    @staticmethod
+    def _detach(entity: Entity, components: typing.Iterable):
+        for comp in components:
+            if (func := getattr(comp, "at_world_remove", None)):
+                func(entity)
+
+    def add_component(self, entity: Entity, component_instance, type_alias=None) -> None:
+        component_type = type_alias or type(component_instance)
+        if (func := getattr(component_instance, "at_world_pre_add", None)):
+            func(entity)
+        if (old := self._entities[entity].get(component_type, None)) is not None and old is not component_instance:
+            self._detach(entity, (old,))
+        super().add_component(entity, component_instance, type_alias=type_alias)
+        if (func := getattr(component_instance, "at_world_add", None)):
+            func(entity)
+        self._view_add(entity, component_type)
+        self._forget(entity)
+
+    def remove_component(self, entity: Entity, component_type: typing.Type):
+        result = super().remove_component(entity, component_type)
+        self._view_discard(entity, (component_type,))
+        self._detach(entity, (result,))
+        self._forget(entity)
+        return result
+
+    def delete_entity(self, entity: Entity, immediate: bool = False) -> None:
+        if immediate:
+            components = self._entities[entity]
+            self._view_discard(entity, list(components))
+            self._detach(entity, list(components.values()))
+            # it may already be waiting on deferred deletion.
+            self._dead_entities.discard(entity)
+            self._forget(entity)
+            self._versions.pop(entity, None)
+        super().delete_entity(entity, immediate=immediate)
+
+    def _clear_dead_entities(self):
+        entity_db = self._entities
+        for entity in self._dead_entities:
+            if (components := entity_db.get(entity, None)) is not None:
+                self._view_discard(entity, components)
+                self._detach(entity, components.values())
+            self._forget(entity)
+            self._versions.pop(entity, None)
+        super()._clear_dead_entities()
+
+    def clear_database(self) -> None:
+        for entity, components in list(self._entities.items()):
+            self._detach(entity, list(components.values()))
+        super().clear_database()
+        for found in self._views.values():
+            found.clear()
+        self._versions.clear()
+        for cache in self._entity_caches:
+            cache.clear()
+        invalidate_memo()